@@ -11,7 +11,8 @@ class BookInline(admin.TabularInline):
 
 
 class BookAdminForm(forms.ModelForm):
-    author_name = forms.CharField(label="Muallif", required=True)
+    # Not "author_name": that is the denormalized (non-editable) Book column.
+    author_input = forms.CharField(label="Muallif", required=True)
 
     class Meta:
         model = Book
@@ -19,7 +20,7 @@ class BookAdminForm(forms.ModelForm):
             "title",
             "slug",
             "category",
-            "author_name",
+            "author_input",
             "sale_price",
             "description",
             "cover_image",
@@ -34,10 +35,10 @@ class BookAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self.instance and self.instance.pk and self.instance.author_id:
-            self.fields["author_name"].initial = self.instance.author.name
+            self.fields["author_input"].initial = self.instance.author.name
 
     def save(self, commit=True):
-        author_name = self.cleaned_data.get("author_name", "").strip()
+        author_name = self.cleaned_data.get("author_input", "").strip()
         author_obj, _ = Author.objects.get_or_create(name=author_name)
         self.instance.author = author_obj
         return super().save(commit=commit)
@@ -45,7 +46,7 @@ class BookAdminForm(forms.ModelForm):
 
 @admin.register(Author)
 class AuthorAdmin(admin.ModelAdmin):
-    list_display = ("name", "is_featured")
+    list_display = ("name", "is_featured", "book_count")
     search_fields = ("name",)
     list_editable = ("is_featured",)
     inlines = [BookInline]
@@ -53,7 +54,7 @@ class AuthorAdmin(admin.ModelAdmin):
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ("name", "parent", "slug")
+    list_display = ("name", "parent", "slug", "book_count")
     prepopulated_fields = {"slug": ("name",)}
     search_fields = ("name",)
     list_filter = ("parent",)
@@ -63,7 +64,7 @@ class CategoryAdmin(admin.ModelAdmin):
 class BookAdmin(admin.ModelAdmin):
     list_display = ("title", "category", "author", "sale_price", "is_recommended", "views", "created_at")
     list_filter = ("category", "author", "is_recommended", "book_format")
-    search_fields = ("title", "author__name")
+    search_fields = ("title", "author_name")
     prepopulated_fields = {"slug": ("title",)}
     autocomplete_fields = ("category",)
     form = BookAdminForm
@@ -43,6 +43,11 @@ def home_featured_books_key(category_id: int, limit: int, lang=None):
     return make_key("home:featured_books", category_id, limit, lang=lang)
 
 
+def home_section_version_key(section: str):
+    # Deferred home strips: part of the fragment URL, bumped by the signals that change the strip.
+    return make_key("home:section:version", section, lang="all")
+
+
 def home_best_selling_key(lang=None):
     return make_key("home:best_selling_top6", lang=lang)
 
@@ -64,9 +69,57 @@ def recommended_list_key(lang=None):
     return make_key("books:recommended:list", lang=lang)
 
 
-def categories_top_key(lang=None):
-    return make_key("categories:list:top", lang=lang)
+# Per-book API JSON fragments
+def book_version_key(book_id: int):
+    return make_key("book:version", book_id, lang="all")
+
+
+def book_json_generation_key():
+    # Bumped when author/category names change; those are embedded in every book fragment.
+    return make_key("book:json:generation", lang="all")
+
+
+def book_json_key(book_id: int, version: str, generation: str, origin: str, fields: str = None, lang=None):
+    return make_key("book:json", book_id, version, generation, origin, fields, lang=lang)
+
+
+# Rendered HTML book cards; same version/generation stamps as the JSON fragments
+def book_card_key(book_id: int, variant: str, version: str, generation: str, lang=None):
+    return make_key("book:card", book_id, variant, version, generation, lang=lang)
+
+
+# Conditional GET (ETag / Last-Modified) for catalog APIs
+def catalog_state_key():
+    return make_key("catalog:state", lang="all")
+
+
+def api_etag_key(url_hash: str, version: str, lang=None):
+    return make_key("api:etag", url_hash, version, lang=lang)
+
+
+# api/bootstrap/ public sections (encoded JSON + hash)
+def bootstrap_section_key(section: str, version: str, origin: str, lang=None):
+    return make_key("bootstrap:section", section, version, origin, lang=lang)
+
+
+def category_tree_key():
+    # v2: nodes carry per-subtree author lists; old pickles must not be reused.
+    return make_key("categories:tree:v2", lang="all")
+
+
+# Facet bitmaps: the stamp is bumped by catalog signals, the index is stored per stamp.
+def facet_index_stamp_key():
+    return make_key("facets:stamp", lang="all")
+
+
+def facet_index_key(stamp: str):
+    return make_key("facets:index", stamp, lang="all")
+
+
+# Change log for the per-process columnar catalog index (services/catalog_index.py)
+def catalog_index_log_version_key():
+    return make_key("catalog:index:log:version", lang="all")
 
 
-def nav_categories_key(lang=None):
-    return make_key("nav:categories:all", lang=lang)
+def catalog_index_log_entry_key(version: int):
+    return make_key("catalog:index:log", version, lang="all")
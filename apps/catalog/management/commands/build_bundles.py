@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+from django.template.utils import get_app_template_dirs
+
+from apps.catalog.services.bundles import BUNDLE_DIR, CRITICAL_CSS_BUDGET, bundle_root
+from apps.catalog.templatetags.bundles import BundleNode
+
+
+def bundle_templates():
+    """Names of project/app templates that contain a {% bundle %} block."""
+    dirs = [Path(d) for engine in settings.TEMPLATES for d in engine.get("DIRS", [])]
+    dirs += [Path(d) for d in get_app_template_dirs("templates")]
+    names = set()
+    for base in dirs:
+        for path in base.rglob("*.html"):
+            if "{% bundle " in path.read_text(encoding="utf-8"):
+                names.add(path.relative_to(base).as_posix())
+    return sorted(names)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the CSS/JS of {% bundle %} template blocks to static/bundles/ as content-hashed files. "
+        "Run before collectstatic on every deploy."
+    )
+
+    def handle(self, *args, **options):
+        bundles = {}  # (name, kind) -> (path, content, kind, mode, template)
+        for template_name in bundle_templates():
+            for node in get_template(template_name).template.nodelist.get_nodes_by_type(BundleNode):
+                content = node.content()
+                seen = bundles.get((node.name, node.kind))
+                if seen is not None and seen[1] != content:
+                    raise CommandError(
+                        f"build_bundles: {node.kind} bundle '{node.name}' differs between {seen[4]} and {template_name}"
+                    )
+                bundles[(node.name, node.kind)] = (node.path(), content, node.kind, node.mode, template_name)
+
+        critical = {
+            name: len(b[1].encode("utf-8")) for (name, kind), b in bundles.items() if kind == "css" and b[3] == "inline"
+        }
+        over = {name: size for name, size in critical.items() if size > CRITICAL_CSS_BUDGET}
+        if over:
+            detail = ", ".join(f"{name} {size} B" for name, size in over.items())
+            raise CommandError(f"build_bundles: inline CSS over the {CRITICAL_CSS_BUDGET} B budget: {detail}")
+
+        out_dir = bundle_root() / BUNDLE_DIR
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = set()
+        for (name, _), (path, content, kind, mode, template_name) in sorted(bundles.items()):
+            if mode == "inline":
+                self.stdout.write(f"  {name}.{kind}: {len(content.encode('utf-8'))} B inline ({template_name})")
+                continue
+            target = bundle_root() / path
+            if not target.exists():
+                target.write_text(content, encoding="utf-8")
+            written.add(target.name)
+            self.stdout.write(f"  {path}: {len(content.encode('utf-8'))} B ({template_name})")
+        for stale in out_dir.iterdir():
+            if stale.is_file() and stale.name not in written:
+                stale.unlink()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"build_bundles: {len(written)} file(s) in {out_dir}; now run `python manage.py collectstatic --noinput`"
+            )
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = "Write the gzip-compressed full-catalog snapshot and catalog-latest.json manifest under MEDIA_ROOT/snapshots/."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="", help="Public scheme://host used for absolute media URLs")
+
+    def handle(self, *args, **options):
+        manifest = build_snapshot(base_url=options["base_url"] or None)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"build_catalog_snapshot: {manifest['url']} ({manifest['books']} books, "
+                f"{manifest['size']} bytes gzip / {manifest['raw_size']} raw)"
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.models import Author, Banner, Book
+from apps.catalog.services.book_json import bump_book_json_generation
+from apps.catalog.services.conditional import bump_catalog_state
+from apps.catalog.services.snapshot import schedule_snapshot_rebuild
+from apps.catalog.services.thumbnails import IMAGE_FIELDS, ensure_thumbnails
+
+
+class Command(BaseCommand):
+    help = "Generate missing JPEG/WebP thumbnails for book covers, author photos and banners and store image sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate variants that already exist")
+
+    def handle(self, *args, **options):
+        written = 0
+        for model in (Book, Author, Banner):
+            field_name = IMAGE_FIELDS[model].field
+            qs = model._default_manager.exclude(**{field_name: ""}).exclude(**{f"{field_name}__isnull": True})
+            count = 0
+            for instance in qs.order_by("pk").iterator(chunk_size=500):
+                count += ensure_thumbnails(instance, force=options["force"])
+            written += count
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {count} image(s) processed")
+        if written:
+            # Sizes are written with .update(); retire cached JSON so the API picks them up.
+            bump_book_json_generation()
+            bump_catalog_state()
+            schedule_snapshot_rebuild()
+        self.stdout.write(self.style.SUCCESS(f"build_thumbnails: {written} image(s) processed"))
@@ -0,0 +1,113 @@
+import re
+from collections import namedtuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.catalog.models import Author, Banner, Book, CatalogTombstone, Category, FeaturedCategory
+from apps.orders.models import Order
+
+QueryCheck = namedtuple("QueryCheck", ["view", "label", "queryset", "allow_scan"])
+
+# Plan lines that mean "read the whole table" or "sort after reading", per backend.
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?!.*USING (COVERING )?INDEX)(?!.*USING INTEGER PRIMARY KEY)"),
+    "postgresql": re.compile(r"\bSeq Scan on\b"),
+    "mysql": re.compile(r'"access_type":\s*"ALL"'),
+}
+SORT_PATTERNS = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR ORDER BY"),
+    "postgresql": re.compile(r"^\s*(->\s*)?Sort\b", re.MULTILINE),
+    "mysql": re.compile(r'"using_filesort":\s*true'),
+}
+
+
+def query_checks():
+    """
+    One entry per query shape the public views and APIs run, with real ids where available.
+    Small admin-managed tables (banners, featured rows, categories) may be scanned.
+    """
+    category_id = Category.objects.order_by("id").values_list("id", flat=True).first() or 0
+    author_id = Author.objects.order_by("id").values_list("id", flat=True).first() or 0
+    book_id = Book.objects.order_by("id").values_list("id", flat=True).first() or 0
+    phone = Order.objects.values_list("phone", flat=True).first() or "+998000000000"
+    since = timezone.now() - timezone.timedelta(days=1)
+    books = Book.objects.all()
+
+    return [
+        QueryCheck("home", "featured category strip", books.filter(category_id=category_id).order_by("-created_at")[:10], False),
+        QueryCheck("home", "best selling", books.order_by("-views")[:6], False),
+        QueryCheck("home", "new books", books.order_by("-created_at")[:6], False),
+        QueryCheck("home", "recommended", books.filter(is_recommended=True).order_by("-created_at")[:6], False),
+        QueryCheck("home", "featured authors", Author.objects.filter(is_featured=True)[:10], True),
+        QueryCheck("home", "banners", Banner.objects.filter(is_active=True).order_by("order", "-created_at")[:5], True),
+        QueryCheck("home", "featured categories", FeaturedCategory.objects.filter(is_active=True), True),
+        QueryCheck("recommended_list", "recommended", books.filter(is_recommended=True).order_by("-created_at"), False),
+        QueryCheck("category_detail", "newest", books.filter(category_id=category_id).order_by("-created_at"), False),
+        QueryCheck("category_detail", "popular", books.filter(category_id=category_id).order_by("-views"), False),
+        QueryCheck("category_detail", "price asc", books.filter(category_id=category_id).order_by("sale_price"), False),
+        QueryCheck("category_detail", "price desc", books.filter(category_id=category_id).order_by("-sale_price"), False),
+        QueryCheck("author_detail", "books by author", books.filter(author_id=author_id).order_by("-created_at"), False),
+        QueryCheck(
+            "book_detail",
+            "similar books",
+            books.filter(category_id=category_id).exclude(id=book_id).order_by("-views")[:10],
+            False,
+        ),
+        QueryCheck("search", "top searched", books.order_by("-views")[:5], False),
+        QueryCheck("api_book_changes", "changed books", books.filter(updated_at__gt=since).order_by("updated_at", "id")[:501], False),
+        QueryCheck(
+            "api_book_changes",
+            "tombstones",
+            CatalogTombstone.objects.filter(deleted_at__gte=since).order_by("deleted_at", "id"),
+            False,
+        ),
+        QueryCheck(
+            "profile",
+            "orders by phone",
+            Order.objects.filter(phone=phone)
+            .order_by("-created_at")
+            .only("id", "created_at", "status", "total_price", "delivery_fee", "address"),
+            False,
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the query shapes behind the catalog/profile views and report full table scans and extra sorts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not only problems")
+        parser.add_argument("--fail-on-scan", action="store_true", help="Exit with an error if an unexpected full scan is found")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        scan_re = FULL_SCAN_PATTERNS.get(vendor)
+        sort_re = SORT_PATTERNS.get(vendor)
+        if scan_re is None:
+            raise CommandError(f"explain_queries: unsupported database backend '{vendor}'")
+        explain_kwargs = {"format": "json"} if vendor == "mysql" else {}
+
+        problems = 0
+        for check in query_checks():
+            plan = check.queryset.explain(**explain_kwargs)
+            scans = [line for line in plan.splitlines() if scan_re.search(line)]
+            sorted_after = bool(sort_re.search(plan))
+            name = f"{check.view}: {check.label}"
+            if scans and not check.allow_scan:
+                problems += 1
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}"))
+            elif sorted_after and not check.allow_scan:
+                self.stdout.write(self.style.WARNING(f"SORT       {name}"))
+            else:
+                self.stdout.write(f"ok         {name}")
+            if options["verbose_plans"] or (scans and not check.allow_scan):
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        # Postgres prefers sequential scans on tiny tables; run this against production-sized data.
+        summary = f"explain_queries: {problems} unexpected full scan(s) on {vendor}"
+        if problems and options["fail_on_scan"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary) if not problems else self.style.WARNING(summary))
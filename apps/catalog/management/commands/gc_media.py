@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.media_gc import collect_garbage
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete uploaded images, thumbnails and resized variants that no database row references "
+        "(run from cron, e.g. daily)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be deleted")
+        parser.add_argument(
+            "--min-age", type=float, default=24, help="Keep files younger than this many hours (default 24)"
+        )
+
+    def handle(self, *args, **options):
+        def log(name, size):
+            if options["dry_run"] or options["verbosity"] > 1:
+                self.stdout.write(f"  {name} ({size} bytes)")
+
+        result = collect_garbage(min_age=options["min_age"] * 3600, dry_run=options["dry_run"], log=log)
+        verb = "would remove" if options["dry_run"] else "removed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"gc_media: scanned {result.scanned} file(s), {verb} {result.removed} "
+                f"({result.freed_bytes / 1024 / 1024:.1f} MB)"
+            )
+        )
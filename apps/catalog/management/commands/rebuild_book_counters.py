@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.category_tree import invalidate_category_tree
+from apps.catalog.services.counters import rebuild_book_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute Author/Category book counters and the category-author summary table from Book rows."
+
+    def handle(self, *args, **options):
+        rows = rebuild_book_counters()
+        invalidate_category_tree()
+        self.stdout.write(self.style.SUCCESS(f"rebuild_book_counters: {rows} category/author rows"))
@@ -0,0 +1,118 @@
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from config.sqlite_backend import PRODUCTION_PRAGMAS
+
+# stock = what django.db.backends.sqlite3 does out of the box (rollback journal,
+# synchronous=FULL, 5 s timeout, deferred BEGIN); tuned = config.sqlite_backend.
+PROFILES = {
+    "stock": {"pragmas": {}, "begin": "BEGIN"},
+    "tuned": {"pragmas": PRODUCTION_PRAGMAS, "begin": "BEGIN IMMEDIATE"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare read/write concurrency of stock vs tuned SQLite on a scratch database: reader "
+        "threads run listing queries while writer threads bump view counters. Never touches the real DB."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=5.0, help="Duration per profile")
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--rows", type=int, default=20000)
+
+    def _connect(self, path, profile):
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        for name, value in PROFILES[profile]["pragmas"].items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _prepare(self, path, profile, rows):
+        conn = self._connect(path, profile)
+        conn.execute("CREATE TABLE book (id INTEGER PRIMARY KEY, category INTEGER, views INTEGER, title TEXT)")
+        conn.execute("CREATE INDEX book_category_views ON book (category, views)")
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO book (id, category, views, title) VALUES (?, ?, ?, ?)",
+            ((i, i % 50, random.randint(0, 1000), f"Kitob {i}") for i in range(1, rows + 1)),
+        )
+        conn.execute("COMMIT")
+        conn.close()
+
+    def _run(self, path, profile, seconds, readers, writers, rows):
+        stats = {"reads": 0, "writes": 0, "read_errors": 0, "write_errors": 0, "write_wait": 0.0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+        begin = PROFILES[profile]["begin"]
+
+        def reader():
+            conn = self._connect(path, profile)
+            reads = errors = 0
+            while time.monotonic() < deadline:
+                try:
+                    conn.execute(
+                        "SELECT id, title FROM book WHERE category = ? ORDER BY views DESC LIMIT 20",
+                        (random.randrange(50),),
+                    ).fetchall()
+                    reads += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+            conn.close()
+            with lock:
+                stats["reads"] += reads
+                stats["read_errors"] += errors
+
+        def writer():
+            conn = self._connect(path, profile)
+            writes = errors = 0
+            waited = 0.0
+            while time.monotonic() < deadline:
+                book_id = random.randint(1, rows)
+                started = time.monotonic()
+                try:
+                    # Same shape as a Django atomic block: read, then write.
+                    conn.execute(begin)
+                    conn.execute("SELECT views FROM book WHERE id = ?", (book_id,)).fetchone()
+                    conn.execute("UPDATE book SET views = views + 1 WHERE id = ?", (book_id,))
+                    conn.execute("COMMIT")
+                    writes += 1
+                except sqlite3.OperationalError:
+                    errors += 1
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                waited += time.monotonic() - started
+            conn.close()
+            with lock:
+                stats["writes"] += writes
+                stats["write_errors"] += errors
+                stats["write_wait"] += waited
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
+
+    def handle(self, *args, **options):
+        seconds, readers, writers, rows = options["seconds"], options["readers"], options["writers"], options["rows"]
+        self.stdout.write(f"sqlite_benchmark: {readers} readers, {writers} writers, {rows} rows, {seconds:g}s per profile")
+        with tempfile.TemporaryDirectory() as tmp:
+            for profile in PROFILES:
+                path = str(Path(tmp) / f"{profile}.sqlite3")
+                self._prepare(path, profile, rows)
+                stats = self._run(path, profile, seconds, readers, writers, rows)
+                avg_write_ms = 1000 * stats["write_wait"] / max(stats["writes"] + stats["write_errors"], 1)
+                self.stdout.write(
+                    f"  {profile:6} reads/s {stats['reads'] / seconds:9.0f}  writes/s {stats['writes'] / seconds:8.0f}  "
+                    f"avg write {avg_write_ms:6.1f} ms  locked errors: {stats['read_errors']} read / {stats['write_errors']} write"
+                )
@@ -0,0 +1,47 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = (
+        "SQLite housekeeping for single-host installs: PRAGMA optimize and a WAL checkpoint "
+        "(run from cron, e.g. hourly). Does nothing on other databases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--analyze", action="store_true", help="Run a full ANALYZE instead of PRAGMA optimize")
+        parser.add_argument("--vacuum", action="store_true", help="Also VACUUM (rewrites the file; run off-peak)")
+
+    def _wal_size(self):
+        path = f"{connection.settings_dict['NAME']}-wal"
+        return os.path.getsize(path) if os.path.exists(path) else 0
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stdout.write(f"sqlite_maintenance: database is {connection.vendor}, nothing to do")
+            return
+
+        wal_before = self._wal_size()
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE" if options["analyze"] else "PRAGMA optimize")
+            if options["vacuum"]:
+                cursor.execute("VACUUM")
+            # TRUNCATE resets the -wal file to zero bytes once every reader has moved on.
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, log_frames, checkpointed = cursor.fetchone()
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+
+        if journal_mode != "wal":
+            self.stdout.write(self.style.WARNING(f"journal_mode is '{journal_mode}', expected 'wal' (DJANGO_SQLITE_TUNING)"))
+        summary = (
+            f"sqlite_maintenance: {'analyze' if options['analyze'] else 'optimize'} done, "
+            f"checkpointed {checkpointed}/{log_frames} WAL frames, "
+            f"-wal {wal_before} -> {self._wal_size()} bytes"
+        )
+        if busy:
+            self.stdout.write(self.style.WARNING(summary + " (readers still active, checkpoint incomplete)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
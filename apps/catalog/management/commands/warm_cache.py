@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.catalog.services.warmup import (
+    collect_urls,
+    default_base_url,
+    preload_templates,
+    warm_data_caches,
+    warm_urls,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-populate catalog data caches, compiled templates and the page cache for top URLs. "
+        "Run after deploy when the cache is shared (Redis); locmem workers warm themselves via CACHE_WARMUP_ON_BOOT."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--urls-file", default=getattr(settings, "CACHE_WARMUP_URLS_FILE", ""), help="File with one path per line")
+        parser.add_argument("--access-log", default=getattr(settings, "CACHE_WARMUP_ACCESS_LOG", ""), help="Apache/Passenger access log to mine top URLs from")
+        parser.add_argument("--top", type=int, default=50, help="How many URLs to take from the access log")
+        parser.add_argument("--base-url", default="", help="Public scheme://host used for page cache keys")
+        parser.add_argument("--workers", type=int, default=getattr(settings, "CACHE_WARMUP_WORKERS", 4))
+        parser.add_argument("--lang", action="append", dest="langs", help="Language code to warm (repeatable)")
+        parser.add_argument("--skip-pages", action="store_true", help="Only warm data caches and templates")
+
+    def handle(self, *args, **options):
+        templates = preload_templates()
+        self.stdout.write(f"templates: {templates} compiled")
+
+        langs = options["langs"] or [settings.LANGUAGE_CODE]
+        warm_data_caches(langs)
+        self.stdout.write(f"data caches: warmed for {', '.join(langs)}")
+
+        if options["skip_pages"]:
+            return
+
+        urls = collect_urls(
+            urls_file=options["urls_file"] or None,
+            access_log=options["access_log"] or None,
+            top=options["top"],
+        )
+        base_url = options["base_url"] or default_base_url()
+        results = warm_urls(urls, base_url=base_url, workers=options["workers"])
+        failed = 0
+        for url, status, elapsed in results:
+            line = f"{status or 'ERR'} {elapsed * 1000:7.1f}ms {url}"
+            if status == 200:
+                self.stdout.write(line)
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(line))
+        summary = f"warm_cache: {len(results)} urls on {base_url}, {failed} failed."
+        self.stdout.write(self.style.SUCCESS(summary) if not failed else self.style.WARNING(summary))
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-19 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0012_alter_book_purchase_price_nullable"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name="Yangilangan"),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name="Yangilangan"),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name="Yangilangan"),
+        ),
+        migrations.CreateModel(
+            name="CatalogTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("book", "Kitob"), ("author", "Muallif"), ("category", "Kategoriya")], max_length=20)),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "verbose_name": "O‘chirilgan yozuv",
+                "verbose_name_plural": "O‘chirilgan yozuvlar",
+                "ordering": ["deleted_at", "id"],
+                "indexes": [models.Index(fields=["kind", "deleted_at"], name="tombstone_kind_deleted")],
+            },
+        ),
+    ]
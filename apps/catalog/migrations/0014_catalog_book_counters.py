@@ -0,0 +1,68 @@
+# Generated by Django 5.0.6 on 2026-10-19 00:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Author = apps.get_model("catalog", "Author")
+    Book = apps.get_model("catalog", "Book")
+    Category = apps.get_model("catalog", "Category")
+    CategoryAuthorStat = apps.get_model("catalog", "CategoryAuthorStat")
+
+    rows = (
+        Book.objects.order_by()
+        .values("category_id", "author_id")
+        .annotate(n=Count("id"))
+        .values_list("category_id", "author_id", "n")
+    )
+    stats = [CategoryAuthorStat(category_id=c, author_id=a, book_count=n) for c, a, n in rows]
+    CategoryAuthorStat.objects.bulk_create(stats, batch_size=1000)
+
+    category_counts, author_counts = {}, {}
+    for stat in stats:
+        category_counts[stat.category_id] = category_counts.get(stat.category_id, 0) + stat.book_count
+        author_counts[stat.author_id] = author_counts.get(stat.author_id, 0) + stat.book_count
+    for category_id, n in category_counts.items():
+        Category.objects.filter(pk=category_id).update(book_count=n)
+    for author_id, n in author_counts.items():
+        Author.objects.filter(pk=author_id).update(book_count=n)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0013_catalog_updated_at_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="book_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Kitoblar soni"),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="book_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Kitoblar soni"),
+        ),
+        migrations.CreateModel(
+            name="CategoryAuthorStat",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("book_count", models.PositiveIntegerField(default=0)),
+                ("author", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="category_stats", to="catalog.author")),
+                ("category", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="author_stats", to="catalog.category")),
+            ],
+            options={
+                "verbose_name": "Kategoriya/muallif statistikasi",
+                "verbose_name_plural": "Kategoriya/muallif statistikasi",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="categoryauthorstat",
+            constraint=models.UniqueConstraint(fields=("category", "author"), name="uniq_category_author_stat"),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0014_catalog_book_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["category", "-created_at"], name="book_category_created"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["category", "-views"], name="book_category_views"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["category", "sale_price"], name="book_category_price"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["author", "-created_at"], name="book_author_created"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(fields=["is_recommended", "-created_at"], name="book_recommended_created"),
+        ),
+    ]
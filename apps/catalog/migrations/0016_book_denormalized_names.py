@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-19 00:47
+
+from django.db import migrations, models
+
+
+def backfill_names(apps, schema_editor):
+    Book = apps.get_model("catalog", "Book")
+    batch = []
+    for book in Book.objects.select_related("author", "category").iterator(chunk_size=1000):
+        book.author_name = book.author.name
+        book.category_name = book.category.name
+        book.category_slug = book.category.slug
+        parts = (book.title, book.author_name, book.category_name)
+        book.search_text = " ".join(part.strip() for part in parts if part).lower()
+        batch.append(book)
+        if len(batch) >= 1000:
+            Book.objects.bulk_update(batch, ["author_name", "category_name", "category_slug", "search_text"])
+            batch = []
+    if batch:
+        Book.objects.bulk_update(batch, ["author_name", "category_name", "category_slug", "search_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0015_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="author_name",
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name="Muallif nomi"),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="category_name",
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name="Kategoriya nomi"),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="category_slug",
+            field=models.SlugField(blank=True, editable=False, verbose_name="Kategoriya slugi"),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="search_text",
+            field=models.TextField(blank=True, editable=False, verbose_name="Qidiruv matni"),
+        ),
+        migrations.RunPython(backfill_names, migrations.RunPython.noop),
+    ]
@@ -3,11 +3,24 @@ from django.urls import reverse
 from django.utils.text import slugify
 
 
+def build_search_text(*parts) -> str:
+    """Lower-cased haystack for catalog search: title, author and category names."""
+    return " ".join(part.strip() for part in parts if part).lower()
+
+
 class Author(models.Model):
     name = models.CharField("Muallif", max_length=255, db_index=True)
     bio = models.TextField("Tarjimai hol", blank=True)
     is_featured = models.BooleanField("Asosiy sahifada ko‘rsatish", default=False)
     photo = models.ImageField("Rasm", upload_to="authors/", blank=True, null=True)
+    # Size and placeholder of the original photo; set with the thumbnails (services.thumbnails).
+    photo_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    photo_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    photo_color = models.CharField(max_length=7, blank=True, editable=False)  # "#rrggbb" placeholder
+    photo_placeholder = models.TextField(blank=True, editable=False)  # tiny blurred preview (data URI)
+    updated_at = models.DateTimeField("Yangilangan", auto_now=True, db_index=True)
+    # Denormalized; maintained by Book signals (see services.counters).
+    book_count = models.PositiveIntegerField("Kitoblar soni", default=0, editable=False)
 
     class Meta:
         ordering = ["name"]
@@ -29,6 +42,9 @@ class Category(models.Model):
         blank=True,
         verbose_name="Ota kategoriya",
     )
+    updated_at = models.DateTimeField("Yangilangan", auto_now=True, db_index=True)
+    # Books directly in this category; subtree totals come from the cached category tree.
+    book_count = models.PositiveIntegerField("Kitoblar soni", default=0, editable=False)
 
     class Meta:
         verbose_name_plural = "Kategoriyalar"
@@ -81,32 +97,95 @@ class Book(models.Model):
     stock_quantity = models.PositiveIntegerField("Ombordagi soni", default=0)
     description = models.TextField("Tavsif", blank=True)
     cover_image = models.ImageField("Muqova", upload_to="covers/", blank=True, null=True)
+    # Size and placeholder of the original cover; set with the thumbnails (services.thumbnails).
+    cover_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    cover_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    cover_color = models.CharField(max_length=7, blank=True, editable=False)  # "#rrggbb" placeholder
+    cover_placeholder = models.TextField(blank=True, editable=False)  # tiny blurred preview (data URI)
     book_format = models.CharField("Format", max_length=10, choices=FORMAT_CHOICES, blank=True)
     pages = models.PositiveIntegerField("Betlar soni", blank=True, null=True)
     is_recommended = models.BooleanField("Tavsiya etilgan", default=False, db_index=True)
     views = models.PositiveIntegerField("Ko‘rishlar soni", default=0, db_index=True)
     created_at = models.DateTimeField("Yaratilgan", auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField("Yangilangan", auto_now=True, db_index=True)
+    # Copies of the related names so listings and search read one table. Filled in save();
+    # Author/Category signals bulk-update them on rename (services.denormalize).
+    author_name = models.CharField("Muallif nomi", max_length=255, blank=True, editable=False)
+    category_name = models.CharField("Kategoriya nomi", max_length=255, blank=True, editable=False)
+    category_slug = models.SlugField("Kategoriya slugi", blank=True, editable=False)
+    search_text = models.TextField("Qidiruv matni", blank=True, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Kitob"
         verbose_name_plural = "Kitoblar"
+        # Composite indexes for the listing access paths: filter on the leading column,
+        # read rows already in the ORDER BY order (descending sorts use a backward scan).
+        indexes = [
+            models.Index(fields=["category", "-created_at"], name="book_category_created"),
+            models.Index(fields=["category", "-views"], name="book_category_views"),
+            models.Index(fields=["category", "sale_price"], name="book_category_price"),
+            models.Index(fields=["author", "-created_at"], name="book_author_created"),
+            models.Index(fields=["is_recommended", "-created_at"], name="book_recommended_created"),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Foreign keys as loaded, so save() only reads Author/Category again when they change.
+        instance._loaded_fk_ids = (instance.__dict__.get("author_id"), instance.__dict__.get("category_id"))
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
+        self.fill_denormalized_fields()
         super().save(*args, **kwargs)
+        self._loaded_fk_ids = (self.author_id, self.category_id)
+
+    def fill_denormalized_fields(self):
+        loaded_author_id, loaded_category_id = getattr(self, "_loaded_fk_ids", (None, None))
+        if not self.author_name or self.author_id != loaded_author_id:
+            self.author_name = self.author.name
+        if not (self.category_name and self.category_slug) or self.category_id != loaded_category_id:
+            self.category_name = self.category.name
+            self.category_slug = self.category.slug
+        # Renames reach the copies through the Author/Category signals (services.denormalize).
+        self.search_text = build_search_text(self.title, self.author_name, self.category_name)
 
     def get_absolute_url(self):
         return reverse("book_detail", args=[self.id, self.slug])
 
 
+class CategoryAuthorStat(models.Model):
+    """How many books an author has in a category; feeds sidebars and counts without GROUP BY on Book."""
+
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="author_stats")
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name="category_stats")
+    book_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["category", "author"], name="uniq_category_author_stat"),
+        ]
+        verbose_name = "Kategoriya/muallif statistikasi"
+        verbose_name_plural = "Kategoriya/muallif statistikasi"
+
+    def __str__(self):
+        return f"{self.category_id}/{self.author_id}: {self.book_count}"
+
+
 class Banner(models.Model):
     title = models.CharField(max_length=255, blank=True)
     image = models.ImageField(upload_to="banners/")
+    # Size and placeholder of the original image; set with the thumbnails (services.thumbnails).
+    image_width = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_height = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)  # "#rrggbb" placeholder
+    image_placeholder = models.TextField(blank=True, editable=False)  # tiny blurred preview (data URI)
     link = models.URLField(blank=True)
     order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
@@ -135,3 +214,29 @@ class AboutPage(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class CatalogTombstone(models.Model):
+    """Deleted catalog rows, kept for a while so delta-sync clients can drop them from local replicas."""
+
+    KIND_BOOK = "book"
+    KIND_AUTHOR = "author"
+    KIND_CATEGORY = "category"
+    KIND_CHOICES = [
+        (KIND_BOOK, "Kitob"),
+        (KIND_AUTHOR, "Muallif"),
+        (KIND_CATEGORY, "Kategoriya"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["deleted_at", "id"]
+        indexes = [models.Index(fields=["kind", "deleted_at"], name="tombstone_kind_deleted")]
+        verbose_name = "O‘chirilgan yozuv"
+        verbose_name_plural = "O‘chirilgan yozuvlar"
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
@@ -0,0 +1,155 @@
+"""JSON shapes shared by the public API, delta sync and catalog snapshots."""
+from .services.thumbnails import IMAGE_FIELDS, instance_placeholder, instance_thumbnails
+
+
+def abs_media_url(request, field):
+    if not field:
+        return None
+    try:
+        url = field.url
+    except Exception:
+        return None
+    return request.build_absolute_uri(url)
+
+
+def abs_thumbnails(request, instance):
+    """Size-specific JPEG/WebP URLs of an instance's image, smallest first; [] until generated."""
+    thumbs, _, _ = instance_thumbnails(instance)
+    if not thumbs:
+        return []
+    storage = getattr(instance, IMAGE_FIELDS[type(instance)].field).storage
+    return [
+        {
+            "width": thumb.width,
+            "height": thumb.height,
+            "jpeg": request.build_absolute_uri(storage.url(thumb.jpeg)),
+            "webp": request.build_absolute_uri(storage.url(thumb.webp)),
+        }
+        for thumb in thumbs
+    ]
+
+
+def placeholder_json(instance):
+    """{"color": "#rrggbb", "preview": "data:image/webp;base64,..."} to paint before the image loads."""
+    placeholder = instance_placeholder(instance)
+    if placeholder is None:
+        return None
+    return {"color": placeholder.color, "preview": placeholder.data_uri or None}
+
+
+def serialize_category(category):
+    return {
+        "id": category.id,
+        "name": category.name,
+        "slug": category.slug,
+        "parent_id": category.parent_id,
+    }
+
+
+def serialize_author(request, author):
+    return {
+        "id": author.id,
+        "name": author.name,
+        "bio": author.bio,
+        "is_featured": author.is_featured,
+        "photo": abs_media_url(request, author.photo),
+        "photo_thumbnails": abs_thumbnails(request, author),
+        "photo_placeholder": placeholder_json(author),
+    }
+
+
+def serialize_banner(request, banner):
+    return {
+        "id": banner.id,
+        "title": banner.title,
+        "image": abs_media_url(request, banner.image),
+        "image_thumbnails": abs_thumbnails(request, banner),
+        "image_placeholder": placeholder_json(banner),
+        "link": banner.link,
+        "order": banner.order,
+        "is_active": banner.is_active,
+    }
+
+
+# Output field -> (model columns needed by .only(), value builder). Order is the response order.
+BOOK_FIELDS = {
+    "id": (("id",), lambda request, book: book.id),
+    "title": (("title",), lambda request, book: book.title),
+    "slug": (("slug",), lambda request, book: book.slug),
+    "description": (("description",), lambda request, book: book.description),
+    "purchase_price": (("purchase_price",), lambda request, book: str(book.purchase_price)),
+    "sale_price": (("sale_price",), lambda request, book: str(book.sale_price)),
+    "stock_quantity": (("stock_quantity",), lambda request, book: book.stock_quantity),
+    "book_format": (("book_format",), lambda request, book: book.book_format),
+    "pages": (("pages",), lambda request, book: book.pages),
+    "is_recommended": (("is_recommended",), lambda request, book: book.is_recommended),
+    "views": (("views",), lambda request, book: book.views),
+    "created_at": (("created_at",), lambda request, book: book.created_at.isoformat()),
+    "cover_image": (("cover_image",), lambda request, book: abs_media_url(request, book.cover_image)),
+    "cover_thumbnails": (
+        ("cover_image", "cover_width", "cover_height"),
+        lambda request, book: abs_thumbnails(request, book),
+    ),
+    "cover_placeholder": (
+        ("cover_image", "cover_color", "cover_placeholder"),
+        lambda request, book: placeholder_json(book),
+    ),
+    "author": (
+        ("author", "author_name"),
+        lambda request, book: {
+            "id": book.author_id,
+            "name": book.author_name,
+        },
+    ),
+    "category": (
+        ("category", "category_name", "category_slug"),
+        lambda request, book: {
+            "id": book.category_id,
+            "name": book.category_name,
+            "slug": book.category_slug,
+        },
+    ),
+}
+
+
+def parse_book_fields(raw):
+    """
+    Parse ?fields=id,title,... into a tuple in canonical order.
+    Returns (fields, invalid); fields is None when the parameter is absent (full payload).
+    """
+    if not raw:
+        return None, []
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    invalid = sorted(requested - BOOK_FIELDS.keys())
+    fields = tuple(name for name in BOOK_FIELDS if name in requested)
+    return (fields or None), invalid
+
+
+def project_book_queryset(qs, fields, extra=()):
+    """
+    Apply only() so a sparse fieldset loads just the columns it prints (plus extra).
+    Author/category names are denormalized onto Book, so no joins are needed.
+    """
+    if fields is None:
+        return qs
+    columns = {"id", *extra}
+    for name in fields:
+        columns.update(BOOK_FIELDS[name][0])
+    return qs.only(*sorted(columns))
+
+
+def serialize_book(request, book, fields=None):
+    return {
+        name: build(request, book)
+        for name, (_, build) in BOOK_FIELDS.items()
+        if fields is None or name in fields
+    }
+
+
+def serialize_category_node(node):
+    """Nested category JSON from a CategoryTree node; book_count includes every descendant."""
+    return {
+        **serialize_category(node),
+        "book_count": node.total_book_count,
+        "children": [serialize_category_node(child) for child in node.children],
+    }
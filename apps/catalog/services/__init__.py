@@ -0,0 +1 @@
+# Package for catalog domain services.
@@ -0,0 +1,90 @@
+"""Public API payload builders shared by the per-resource endpoints and api/bootstrap/."""
+from __future__ import annotations
+
+import hashlib
+from typing import Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from ..cache_keys import bootstrap_section_key
+from ..models import AboutPage
+from ..serializers import (
+    abs_media_url,
+    serialize_author,
+    serialize_banner,
+    serialize_book,
+    serialize_category,
+    serialize_category_node,
+)
+from .book_json import RawJSON, book_fragments, splice_json
+from .cached_queries import CATEGORY_TTL, HOME_TTL, get_home_data
+from .category_tree import get_category_tree
+from .conditional import catalog_state
+
+
+def home_payload(request, fields=None) -> dict:
+    lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
+    home_data = get_home_data(lang)
+    return {
+        "categories": [serialize_category(category) for category in home_data["categories"]],
+        "authors": [serialize_author(request, author) for author in home_data["authors"]],
+        "banners": [serialize_banner(request, banner) for banner in home_data["banners"]],
+        "featured_sections": [
+            {
+                "title": section["title"],
+                "category": serialize_category(section["category"]),
+                "books": book_fragments(request, section["books"], serialize_book, fields),
+            }
+            for section in home_data["featured_sections"]
+        ],
+        "best_selling": book_fragments(request, home_data["best_selling"], serialize_book, fields),
+        "new_books": book_fragments(request, home_data["new_books"], serialize_book, fields),
+        "recommended": book_fragments(request, home_data["recommended"], serialize_book, fields),
+    }
+
+
+def categories_payload(request) -> dict:
+    return {"items": [serialize_category_node(root) for root in get_category_tree().roots]}
+
+
+def about_payload(request) -> dict:
+    about_page = (
+        AboutPage.objects.filter(is_active=True)
+        .order_by("-updated_at", "-id")
+        .first()
+    )
+    data = None
+    if about_page:
+        data = {
+            "title": about_page.title,
+            "body": about_page.body,
+            "link": about_page.link,
+            "image": abs_media_url(request, about_page.image),
+            "updated_at": about_page.updated_at.isoformat(),
+        }
+    return {"item": data}
+
+
+# Section name -> (builder, TTL). Same content and lifetimes as the standalone endpoints.
+PUBLIC_SECTIONS = {
+    "home": (home_payload, HOME_TTL),
+    "categories": (categories_payload, CATEGORY_TTL),
+    "about": (about_payload, CATEGORY_TTL),
+}
+
+
+def cached_section(request, name: str) -> Tuple[str, RawJSON]:
+    """
+    Return (etag, encoded body) for a public section.
+    The body is encoded once per catalog version and origin, so unchanged sections are a cache read.
+    """
+    builder, ttl = PUBLIC_SECTIONS[name]
+    key = bootstrap_section_key(name, catalog_state()["version"], request.build_absolute_uri("/"))
+    entry = cache.get(key)
+    if entry is None:
+        body = splice_json(builder(request))
+        entry = {"etag": hashlib.md5(body.encode("utf-8")).hexdigest(), "body": body}
+        cache.set(key, entry, ttl)
+    return entry["etag"], RawJSON(entry["body"])
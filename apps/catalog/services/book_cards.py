@@ -0,0 +1,46 @@
+"""Rendered HTML book cards, cached per book id, card variant, version stamps and language."""
+from __future__ import annotations
+
+from typing import Iterable, List
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from ..cache_keys import book_card_key
+from .book_json import book_stamps
+
+BOOK_CARD_TTL = 60 * 60 * 6  # cards show no counters; edits bump the version, so this only frees memory
+
+CARD_TEMPLATES = {
+    "grid": "includes/book_card_grid.html",
+    "strip": "includes/book_card_strip.html",
+}
+
+
+def render_book_cards(books: Iterable, variant: str) -> List[SafeString]:
+    """
+    One rendered card per book, rendering only cache misses.
+    Book signals bump the version and Author/Category signals the generation, so an edit
+    retires the card without touching its key; stale entries simply expire.
+    """
+    template_name = CARD_TEMPLATES[variant]
+    books = list(books)
+    if not books:
+        return []
+    generation, versions = book_stamps([book.id for book in books])
+    keys = {book.id: book_card_key(book.id, variant, versions[book.id], generation) for book in books}
+    cached = cache.get_many(list(keys.values()))
+
+    cards = []
+    to_store = {}
+    for book in books:
+        key = keys[book.id]
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string(template_name, {"book": book})
+            to_store[key] = html
+        cards.append(mark_safe(html))
+    if to_store:
+        cache.set_many(to_store, BOOK_CARD_TTL)
+    return cards
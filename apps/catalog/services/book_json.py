@@ -0,0 +1,115 @@
+"""Pre-encoded per-book JSON fragments for the public API."""
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from ..cache_keys import book_json_generation_key, book_json_key, book_version_key
+
+BOOK_JSON_TTL = 60 * 10  # 10 minutes; caps staleness of the views counter, edits bump the version
+
+
+class RawJSON(str):
+    """A string that already holds encoded JSON and is spliced into the body verbatim."""
+
+
+def splice_json(value) -> str:
+    """Encode value like JsonResponse does, but copy RawJSON fragments without re-encoding."""
+    if isinstance(value, RawJSON):
+        return value
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{json.dumps(str(k))}: {splice_json(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(splice_json(v) for v in value) + "]"
+    return json.dumps(value, cls=DjangoJSONEncoder)
+
+
+class SplicedJsonResponse(HttpResponse):
+    """JsonResponse counterpart for payloads that contain RawJSON fragments."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=splice_json(data), **kwargs)
+
+
+def _new_token() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def bump_book_version(book_id: int) -> None:
+    """Called from Book signals; old fragments become unreachable and expire on their own."""
+    cache.set(book_version_key(book_id), _new_token(), None)
+
+
+def bump_book_json_generation() -> None:
+    """Called from Author/Category signals because their names are embedded in every fragment."""
+    cache.set(book_json_generation_key(), _new_token(), None)
+
+
+def book_stamps(ids: List[int]) -> Tuple[str, Dict[int, str]]:
+    """
+    Current (generation, {book_id: version}) tokens in one cache round trip.
+    Shared by the API fragments and the cached HTML book cards.
+    """
+    generation_key = book_json_generation_key()
+    version_keys = {book_id: book_version_key(book_id) for book_id in ids}
+    stamps = cache.get_many([generation_key, *version_keys.values()])
+
+    # Missing stamps get a fresh random token rather than a constant, so an evicted
+    # version key can never resurrect a fragment written before the last edit.
+    new_stamps = {key: _new_token() for key in [generation_key, *version_keys.values()] if key not in stamps}
+    if new_stamps:
+        cache.set_many(new_stamps, None)
+        stamps.update(new_stamps)
+    return stamps[generation_key], {book_id: stamps[key] for book_id, key in version_keys.items()}
+
+
+def book_fragments(request, books: Iterable, serialize: Callable, fields: Optional[tuple] = None) -> List[RawJSON]:
+    """
+    Return one encoded fragment per book, serializing only cache misses.
+    Keys include the request origin because cover URLs are absolute, and the sparse fieldset if any.
+    """
+    books = list(books)
+    by_id = {book.id: book for book in books}
+    return book_fragments_for_ids(request, [book.id for book in books], lambda ids: by_id, serialize, fields)
+
+
+def book_fragments_for_ids(
+    request, ids: List[int], load: Callable, serialize: Callable, fields: Optional[tuple] = None
+) -> List[RawJSON]:
+    """
+    Like book_fragments, but only calls load(missing_ids) -> {id: book} for cache misses,
+    so a fully cached page needs no DB query. Ids the loader cannot find are skipped.
+    """
+    if not ids:
+        return []
+    origin = request.build_absolute_uri("/")
+    generation, versions = book_stamps(ids)
+    variant = ",".join(fields) if fields else None
+    fragment_keys = {
+        book_id: book_json_key(book_id, versions[book_id], generation, origin, variant) for book_id in ids
+    }
+    cached = cache.get_many(list(fragment_keys.values()))
+
+    missing = [book_id for book_id in ids if fragment_keys[book_id] not in cached]
+    loaded = load(missing) if missing else {}
+    fragments = []
+    to_store = {}
+    for book_id in ids:
+        key = fragment_keys[book_id]
+        fragment = cached.get(key)
+        if fragment is None:
+            book = loaded.get(book_id)
+            if book is None:
+                continue
+            fragment = json.dumps(serialize(request, book, fields), cls=DjangoJSONEncoder)
+            to_store[key] = fragment
+        fragments.append(RawJSON(fragment))
+    if to_store:
+        cache.set_many(to_store, BOOK_JSON_TTL)
+    return fragments
@@ -0,0 +1,158 @@
+"""Cached catalog queries shared by HTML views, JSON API and cache warm-up."""
+from django.core.cache import cache
+
+from ..cache_keys import (
+    home_top_categories_key,
+    home_featured_authors_key,
+    home_banners_key,
+    home_featured_cfgs_key,
+    home_featured_books_key,
+    home_best_selling_key,
+    home_new_books_key,
+    home_recommended_key,
+    best_selling_list_key,
+    recommended_list_key,
+)
+from ..models import Author, Banner, Book, Category, FeaturedCategory
+from .category_tree import get_category_tree
+
+HOME_TTL = 60 * 5  # 5 minutes; homepage rotates moderately often
+LIST_TTL = 60 * 10  # 10 minutes; bestseller/recommended lists are stable
+CATEGORY_TTL = 60 * 15  # 15 minutes; taxonomy changes rarely
+
+
+def get_home_top_categories(lang):
+    return cache.get_or_set(
+        home_top_categories_key(lang),
+        lambda: list(Category.objects.filter(parent__isnull=True)[:4]),
+        HOME_TTL,
+    )
+
+
+def get_home_featured_authors(lang):
+    return cache.get_or_set(
+        home_featured_authors_key(lang),
+        lambda: list(Author.objects.filter(is_featured=True)[:10]),
+        HOME_TTL,
+    )
+
+
+def get_home_banners(lang):
+    return cache.get_or_set(
+        home_banners_key(lang),
+        lambda: list(
+            Banner.objects.filter(is_active=True)
+            .order_by("order", "-created_at")
+            .select_related(None)[:5]
+        ),
+        HOME_TTL,
+    )
+
+
+def get_home_featured_cfgs(lang):
+    return cache.get_or_set(
+        home_featured_cfgs_key(lang),
+        lambda: list(
+            FeaturedCategory.objects.filter(is_active=True)
+            .select_related("category")
+        ),
+        HOME_TTL,
+    )
+
+
+def get_home_featured_books(cfg, lang):
+    limit = cfg.limit or 10
+    return cache.get_or_set(
+        home_featured_books_key(cfg.category_id, limit, lang),
+        lambda: list(
+            Book.objects.filter(category=cfg.category)
+            .order_by("-created_at")[:limit]
+        ),
+        HOME_TTL,
+    )
+
+
+def get_home_best_selling(lang):
+    return cache.get_or_set(
+        home_best_selling_key(lang),
+        lambda: list(
+            Book.objects.order_by("-views")[:6]
+        ),
+        LIST_TTL,
+    )
+
+
+def get_home_new_books(lang):
+    return cache.get_or_set(
+        home_new_books_key(lang),
+        lambda: list(
+            Book.objects.order_by("-created_at")[:6]
+        ),
+        HOME_TTL,
+    )
+
+
+def get_home_recommended(lang):
+    return cache.get_or_set(
+        home_recommended_key(lang),
+        lambda: list(
+            Book.objects.filter(is_recommended=True)
+            .order_by("-created_at")[:6]
+        ),
+        LIST_TTL,
+    )
+
+
+def get_home_data(lang):
+    """
+    Return the public home page building blocks as model instances.
+    Each block is cached under its own key so signals can invalidate them independently.
+    """
+    featured_sections = [
+        {
+            "title": cfg.title or cfg.category.name,
+            "category": cfg.category,
+            "books": get_home_featured_books(cfg, lang),
+        }
+        for cfg in get_home_featured_cfgs(lang)
+    ]
+    return {
+        "categories": get_home_top_categories(lang),
+        "authors": get_home_featured_authors(lang),
+        "banners": get_home_banners(lang),
+        "featured_sections": featured_sections,
+        "best_selling": get_home_best_selling(lang),
+        "new_books": get_home_new_books(lang),
+        "recommended": get_home_recommended(lang),
+    }
+
+
+def get_top_categories(lang):
+    # Root nodes of the cached tree, sorted by name; total_book_count covers each subtree.
+    return get_category_tree().roots
+
+
+def get_nav_categories(lang):
+    # Shared navigation categories in tree order; nodes carry children and book counts.
+    return get_category_tree().flat()
+
+
+def get_best_selling_list(lang):
+    # Safe to cache: same for every user, changes only when sales/views change.
+    return cache.get_or_set(
+        best_selling_list_key(lang),
+        lambda: list(Book.objects.order_by("-views")),
+        LIST_TTL,
+    )
+
+
+def get_recommended_list(lang):
+    # Safe to cache: recommendation flag is content-based, not user-based.
+    return cache.get_or_set(
+        recommended_list_key(lang),
+        lambda: list(
+            Book.objects.filter(is_recommended=True)
+            .order_by("-created_at")
+        ),
+        LIST_TTL,
+    )
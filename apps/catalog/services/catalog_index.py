@@ -0,0 +1,251 @@
+"""
+Per-process columnar catalog index for listing, sorting and paginating without the DB.
+
+Columns are `array` module arrays addressed by slot; every sort order is a pre-sorted
+permutation of slots. Book signals append changed ids to a small log in the cache, and each
+process patches its copy from that log on the next read instead of reloading the catalog.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from ..cache_keys import catalog_index_log_entry_key, catalog_index_log_version_key
+from ..models import Book
+
+# Views are bumped with .update() (no signal), so popularity order is rebuilt at most this stale.
+INDEX_MAX_AGE = 60 * 10
+INDEX_LOG_TTL = 60 * 60 * 24
+MAX_LOG_REPLAY = 500  # further behind than this, a full reload is cheaper
+
+# sort name -> (order, descending); matches the sort_map of the listing views.
+SORTS = {
+    "price_asc": ("price", False),
+    "price_desc": ("price", True),
+    "newest": ("created", True),
+    "oldest": ("created", False),
+    "popular": ("views", True),
+    "alpha_asc": ("title", False),
+    "alpha_desc": ("title", True),
+}
+DEFAULT_SORT = "newest"  # Book.Meta.ordering
+ORDERS = ("price", "views", "created", "title")
+
+ROW_FIELDS = (
+    "id", "sale_price", "views", "created_at", "category_id", "author_id", "book_format", "stock_quantity", "title",
+)
+
+
+def _micros(dt) -> int:
+    return int(dt.timestamp() * 1_000_000)
+
+
+class CatalogIndex:
+    def __init__(self):
+        self.ids = array("q")
+        self.price = array("q")
+        self.views = array("q")
+        self.created = array("q")  # epoch microseconds
+        self.category = array("q")
+        self.author = array("q")
+        self.stock = array("q")
+        self.format: List[str] = []
+        self.title: List[str] = []  # casefolded, only used as a sort key
+        self.alive = bytearray()
+        self.slot: Dict[int, int] = {}
+        self.perms: Dict[str, array] = {order: array("q") for order in ORDERS}
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple]) -> "CatalogIndex":
+        index = cls()
+        for row in rows:
+            index._append(row)
+        for order in ORDERS:
+            slots = sorted(range(len(index.ids)), key=lambda s, order=order: index._key(order, s))
+            index.perms[order] = array("q", slots)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.slot)
+
+    def _append(self, row: Tuple) -> int:
+        book_id, price, views, created_at, category_id, author_id, book_format, stock, title = row
+        slot = len(self.ids)
+        self.ids.append(book_id)
+        self.price.append(int(price or 0))
+        self.views.append(views or 0)
+        self.created.append(_micros(created_at))
+        self.category.append(category_id)
+        self.author.append(author_id)
+        self.stock.append(stock or 0)
+        self.format.append(book_format or "")
+        self.title.append((title or "").casefold())
+        self.alive.append(1)
+        self.slot[book_id] = slot
+        return slot
+
+    def _key(self, order: str, slot: int):
+        # Book id breaks ties so every key is unique and bisect finds the exact slot.
+        if order == "price":
+            return (self.price[slot], self.ids[slot])
+        if order == "views":
+            return (self.views[slot], self.ids[slot])
+        if order == "created":
+            return (self.created[slot], self.ids[slot])
+        return (self.title[slot], self.ids[slot])
+
+    def patched(self, rows: Sequence[Tuple], gone: Iterable[int]) -> "CatalogIndex":
+        """
+        Copy with rows upserted and gone ids dropped. Readers keep using the old object,
+        so no locking is needed around queries.
+        """
+        new = CatalogIndex.__new__(CatalogIndex)
+        for name in ("ids", "price", "views", "created", "category", "author", "stock"):
+            setattr(new, name, array("q", getattr(self, name)))
+        new.format = list(self.format)
+        new.title = list(self.title)
+        new.alive = bytearray(self.alive)
+        new.slot = dict(self.slot)
+        new.perms = {order: array("q", perm) for order, perm in self.perms.items()}
+        new.built_at = self.built_at
+
+        for book_id in {*gone, *(row[0] for row in rows)}:
+            slot = new.slot.pop(book_id, None)
+            if slot is None:
+                continue
+            for order, perm in new.perms.items():
+                i = bisect_left(perm, new._key(order, slot), key=lambda s, order=order: new._key(order, s))
+                del perm[i]
+            new.alive[slot] = 0
+        for row in rows:
+            slot = new._append(row)
+            for order, perm in new.perms.items():
+                insort(perm, slot, key=lambda s, order=order: new._key(order, s))
+        return new
+
+    def sorted_ids(
+        self,
+        sort: Optional[str] = None,
+        among: Optional[Iterable[int]] = None,
+        categories: Optional[Iterable[int]] = None,
+        authors: Optional[Iterable[int]] = None,
+    ) -> List[int]:
+        """
+        Book ids in the requested order, restricted to `among` (e.g. a facet match),
+        the given categories and authors. Unknown sorts fall back to newest first.
+        """
+        order, descending = SORTS.get(sort) or SORTS[DEFAULT_SORT]
+        perm = self.perms[order]
+        slots = reversed(perm) if descending else iter(perm)
+        ids = self.ids
+        among = set(among) if among is not None else None
+        categories = set(categories) if categories is not None else None
+        authors = set(authors) if authors is not None else None
+        if among is None and categories is None and authors is None:
+            return [ids[s] for s in slots]
+        category, author = self.category, self.author
+        return [
+            ids[s]
+            for s in slots
+            if (among is None or ids[s] in among)
+            and (categories is None or category[s] in categories)
+            and (authors is None or author[s] in authors)
+        ]
+
+
+def cursor_page(ordered: List[int], cursor: Optional[str], size: int) -> Tuple[List[int], Optional[str]]:
+    """
+    One page of an ordered id list and the cursor for the next one (None on the last page).
+
+    Cursors are "<offset>.<last id>": the page continues after the id it ended on, so books
+    added or removed earlier in the list do not repeat or skip cards; if that book has left
+    the list the offset is used as is.
+    """
+    start = 0
+    if cursor:
+        offset, _, last_id = cursor.partition(".")
+        try:
+            offset, last_id = max(int(offset), 0), int(last_id)
+        except ValueError:
+            offset, last_id = 0, None
+        if 0 < offset <= len(ordered) and ordered[offset - 1] == last_id:
+            start = offset
+        else:
+            try:
+                start = ordered.index(last_id) + 1
+            except ValueError:
+                start = min(offset, len(ordered))
+    ids = ordered[start : start + size]
+    end = start + len(ids)
+    return ids, (f"{end}.{ids[-1]}" if ids and end < len(ordered) else None)
+
+
+def _load_rows(ids: Optional[Iterable[int]] = None) -> List[Tuple]:
+    qs = Book.objects.order_by("id")
+    if ids is not None:
+        qs = qs.filter(id__in=list(ids))
+    return list(qs.values_list(*ROW_FIELDS))
+
+
+_lock = threading.Lock()
+_state: Optional[Tuple[int, CatalogIndex]] = None  # (applied log version, index)
+
+
+def get_catalog_index() -> CatalogIndex:
+    """
+    This process's index, caught up with the change log. The common case costs one
+    cache read; a few edits cost one small query for the changed rows.
+    """
+    global _state
+    version = cache.get(catalog_index_log_version_key()) or 0
+    state = _state
+    if state is not None:
+        applied, index = state
+        if applied == version and time.monotonic() - index.built_at < INDEX_MAX_AGE:
+            return index
+
+    with _lock:
+        state = _state
+        if state is not None and state[0] == version and time.monotonic() - state[1].built_at < INDEX_MAX_AGE:
+            return state[1]
+        index = None
+        if state is not None and 0 < version - state[0] <= MAX_LOG_REPLAY:
+            index = _replay(state[1], state[0], version)
+        if index is None or time.monotonic() - index.built_at >= INDEX_MAX_AGE:
+            index = CatalogIndex.build(_load_rows())
+        _state = (version, index)
+        return index
+
+
+def _replay(index: CatalogIndex, applied: int, version: int) -> Optional[CatalogIndex]:
+    keys = [catalog_index_log_entry_key(v) for v in range(applied + 1, version + 1)]
+    entries = cache.get_many(keys)
+    if len(entries) != len(keys):
+        return None  # an entry expired or was evicted; reload everything
+    changed = set(entries.values())
+    rows = _load_rows(changed)
+    present = {row[0] for row in rows}
+    return index.patched(rows, changed - present)
+
+
+def log_book_change(book_id: int) -> None:
+    """Called from Book signals; runs after commit so readers never load pre-commit rows."""
+
+    def append():
+        key = catalog_index_log_version_key()
+        cache.add(key, 0, None)
+        try:
+            version = cache.incr(key)
+        except ValueError:  # evicted between add and incr
+            cache.add(key, 1, None)
+            version = cache.get(key) or 1
+        cache.set(catalog_index_log_entry_key(version), book_id, INDEX_LOG_TTL)
+
+    transaction.on_commit(append)
@@ -0,0 +1,136 @@
+"""Cached, fully materialized category tree: O(1) descendants, breadcrumbs, book counts and authors per node."""
+from __future__ import annotations
+
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from ..cache_keys import category_tree_key
+from ..models import Category, CategoryAuthorStat
+
+TREE_TTL = 60 * 60  # 1 hour; rebuilt on Category/Author/Book save/delete anyway
+
+# Sidebar entry; book_count is the author's books within the category subtree.
+AuthorRef = namedtuple("AuthorRef", ["id", "name", "book_count"])
+
+
+class CategoryNode:
+    """Template-friendly category record; attribute names match the Category model."""
+
+    __slots__ = ("id", "name", "slug", "parent_id", "children", "book_count", "total_book_count")
+
+    def __init__(self, id, name, slug, parent_id):
+        self.id = id
+        self.name = name
+        self.slug = slug
+        self.parent_id = parent_id
+        self.children: List["CategoryNode"] = []
+        self.book_count = 0  # books directly in this category
+        self.total_book_count = 0  # including every descendant
+
+    def __str__(self):
+        return self.name
+
+
+class CategoryTree:
+    def __init__(self, rows: List[Tuple], stats: List[Tuple]):
+        """rows: (id, name, slug, parent_id, book_count); stats: (category_id, author_id, author_name, book_count)."""
+        self.nodes: Dict[int, CategoryNode] = {}
+        for cat_id, name, slug, parent_id, book_count in rows:
+            self.nodes[cat_id] = CategoryNode(cat_id, name, slug, parent_id)
+            self.nodes[cat_id].book_count = book_count
+        self.by_slug: Dict[str, CategoryNode] = {node.slug: node for node in self.nodes.values()}
+
+        self.roots: List[CategoryNode] = []
+        for node in self.nodes.values():  # rows arrive ordered by name, so children stay sorted
+            parent = self.nodes.get(node.parent_id)
+            if parent is not None and parent is not node:
+                parent.children.append(node)
+            else:
+                self.roots.append(node)
+
+        self.ancestors: Dict[int, Tuple[int, ...]] = {}
+        for node in self.nodes.values():
+            chain = []
+            seen = {node.id}
+            parent = self.nodes.get(node.parent_id)
+            # Guard against parent cycles an admin edit could create.
+            while parent is not None and parent.id not in seen:
+                chain.append(parent.id)
+                seen.add(parent.id)
+                parent = self.nodes.get(parent.parent_id)
+            self.ancestors[node.id] = tuple(reversed(chain))
+
+        self.descendants: Dict[int, Tuple[int, ...]] = {node.id: (node.id,) for node in self.nodes.values()}
+        for node in self.nodes.values():
+            for ancestor_id in self.ancestors[node.id]:
+                self.descendants[ancestor_id] += (node.id,)
+        for node in self.nodes.values():
+            node.total_book_count = sum(self.nodes[i].book_count for i in self.descendants[node.id])
+
+        # Roll each (category, author) count up into every ancestor, then freeze name-sorted lists.
+        rollup: Dict[int, Dict[int, int]] = {cat_id: {} for cat_id in self.nodes}
+        author_names: Dict[int, str] = {}
+        for cat_id, author_id, author_name, book_count in stats:
+            if cat_id not in self.nodes:
+                continue
+            author_names[author_id] = author_name
+            for target in (cat_id, *self.ancestors[cat_id]):
+                rollup[target][author_id] = rollup[target].get(author_id, 0) + book_count
+        self.authors: Dict[int, Tuple[AuthorRef, ...]] = {
+            cat_id: tuple(
+                sorted(
+                    (AuthorRef(a, author_names[a], n) for a, n in counts.items()),
+                    key=lambda ref: (ref.name, ref.id),
+                )
+            )
+            for cat_id, counts in rollup.items()
+        }
+
+    def get(self, category_id: int) -> Optional[CategoryNode]:
+        return self.nodes.get(category_id)
+
+    def get_by_slug(self, slug: str) -> Optional[CategoryNode]:
+        return self.by_slug.get(slug)
+
+    def descendant_ids(self, category_id: int) -> Tuple[int, ...]:
+        """The category itself plus every child, grandchild, ..."""
+        return self.descendants.get(category_id, ())
+
+    def authors_for(self, category_id: int) -> Tuple[AuthorRef, ...]:
+        """Authors with at least one book in the category subtree, sorted by name."""
+        return self.authors.get(category_id, ())
+
+    def breadcrumbs(self, category_id: int) -> List[CategoryNode]:
+        """Ancestors from the root down to the direct parent."""
+        return [self.nodes[i] for i in self.ancestors.get(category_id, ())]
+
+    def flat(self) -> List[CategoryNode]:
+        """Depth-first order (roots by name, then their subtrees)."""
+        result = []
+        stack = list(reversed(self.roots))
+        while stack:
+            node = stack.pop()
+            result.append(node)
+            stack.extend(reversed(node.children))
+        return result
+
+
+def _build_tree() -> CategoryTree:
+    # Counts come from the denormalized counters (services/counters.py): no aggregation over Book.
+    rows = list(Category.objects.order_by("name").values_list("id", "name", "slug", "parent_id", "book_count"))
+    stats = list(
+        CategoryAuthorStat.objects.filter(book_count__gt=0).values_list(
+            "category_id", "author_id", "author__name", "book_count"
+        )
+    )
+    return CategoryTree(rows, stats)
+
+
+def get_category_tree() -> CategoryTree:
+    return cache.get_or_set(category_tree_key(), _build_tree, TREE_TTL)
+
+
+def invalidate_category_tree() -> None:
+    cache.delete(category_tree_key())
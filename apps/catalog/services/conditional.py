@@ -0,0 +1,94 @@
+"""Catalog-wide version stamp and ETag/Last-Modified handling for polled JSON APIs."""
+from __future__ import annotations
+
+import hashlib
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from ..cache_keys import api_etag_key, catalog_state_key
+from ..models import AboutPage, Author, Banner, Book, Category, FeaturedCategory
+
+
+def _latest_change_from_db() -> float:
+    """Best-effort Last-Modified when the stamp is cold: newest created/updated timestamp in the catalog."""
+    candidates = [
+        Book.objects.aggregate(ts=Max("updated_at"))["ts"],
+        Author.objects.aggregate(ts=Max("updated_at"))["ts"],
+        Category.objects.aggregate(ts=Max("updated_at"))["ts"],
+        Banner.objects.aggregate(ts=Max("created_at"))["ts"],
+        FeaturedCategory.objects.aggregate(ts=Max("created_at"))["ts"],
+        AboutPage.objects.aggregate(ts=Max("updated_at"))["ts"],
+    ]
+    stamps = [ts.timestamp() for ts in candidates if ts]
+    return max(stamps) if stamps else datetime(2000, 1, 1, tzinfo=dt_timezone.utc).timestamp()
+
+
+def catalog_state() -> dict:
+    """Return {"version", "changed_at"}; version changes whenever any catalog signal fires."""
+    state = cache.get(catalog_state_key())
+    if state is None:
+        state = {"version": uuid.uuid4().hex[:12], "changed_at": int(_latest_change_from_db())}
+        # add() so concurrent cold workers agree on the first stamp.
+        if not cache.add(catalog_state_key(), state, None):
+            state = cache.get(catalog_state_key()) or state
+    return state
+
+
+def bump_catalog_state() -> None:
+    cache.set(
+        catalog_state_key(),
+        {"version": uuid.uuid4().hex[:12], "changed_at": int(timezone.now().timestamp())},
+        None,
+    )
+
+
+def conditional_catalog_get(ttl: int):
+    """
+    Answer If-None-Match / If-Modified-Since with 304 before cache_page or the view runs.
+    The ETag is a hash of the last body served for this URL and catalog version, remembered for
+    ttl seconds (the page cache TTL), so unchanged polls cost two cache reads and no serialization.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_func(request, *args, **kwargs)
+
+            state = catalog_state()
+            url_hash = hashlib.md5(request.build_absolute_uri().encode("utf-8")).hexdigest()
+            key = api_etag_key(url_hash, state["version"])
+            stored_etag = cache.get(key)
+            if stored_etag:
+                not_modified = get_conditional_response(
+                    request, etag=stored_etag, last_modified=state["changed_at"]
+                )
+                if not_modified is not None:
+                    not_modified["ETag"] = stored_etag
+                    not_modified["Last-Modified"] = http_date(state["changed_at"])
+                    return not_modified
+
+            response = view_func(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+
+            # The compressed page cache already tags its bodies; reuse that over hashing gzip bytes.
+            etag = response.get("ETag") or f'"{hashlib.md5(response.content).hexdigest()}"'
+            if etag != stored_etag:
+                cache.set(key, etag, ttl)
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(state["changed_at"])
+            return get_conditional_response(
+                request, etag=etag, last_modified=state["changed_at"], response=response
+            )
+
+        return wrapper
+
+    return decorator
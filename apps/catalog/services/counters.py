@@ -0,0 +1,68 @@
+"""Denormalized book counters: Author.book_count, Category.book_count and CategoryAuthorStat rows."""
+from __future__ import annotations
+
+from typing import Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count
+
+from ..models import Author, Book, Category, CategoryAuthorStat
+
+Pair = Tuple[Optional[int], Optional[int]]  # (category_id, author_id)
+
+
+def refresh_book_counters(pairs: Iterable[Pair]) -> None:
+    """
+    Recount the (category, author) pairs a Book save/delete touched.
+    Each count is an indexed COUNT over one category or author, so this stays cheap on big
+    catalogs and heals itself if a previous update was lost.
+    """
+    pairs = {pair for pair in pairs if pair[0] and pair[1]}
+    if not pairs:
+        return
+    with transaction.atomic():
+        for category_id, author_id in pairs:
+            n = Book.objects.filter(category_id=category_id, author_id=author_id).count()
+            if n:
+                CategoryAuthorStat.objects.update_or_create(
+                    category_id=category_id, author_id=author_id, defaults={"book_count": n}
+                )
+            else:
+                CategoryAuthorStat.objects.filter(category_id=category_id, author_id=author_id).delete()
+        # .update() skips save(), so counters never touch updated_at or re-fire catalog signals.
+        for category_id in {category_id for category_id, _ in pairs}:
+            Category.objects.filter(pk=category_id).update(
+                book_count=Book.objects.filter(category_id=category_id).count()
+            )
+        for author_id in {author_id for _, author_id in pairs}:
+            Author.objects.filter(pk=author_id).update(
+                book_count=Book.objects.filter(author_id=author_id).count()
+            )
+
+
+def rebuild_book_counters() -> int:
+    """Recompute every counter from scratch (backfill/repair). Returns the number of stat rows."""
+    rows = (
+        Book.objects.order_by()
+        .values("category_id", "author_id")
+        .annotate(n=Count("id"))
+        .values_list("category_id", "author_id", "n")
+    )
+    stats = [CategoryAuthorStat(category_id=c, author_id=a, book_count=n) for c, a, n in rows]
+    category_counts, author_counts = {}, {}
+    for stat in stats:
+        category_counts[stat.category_id] = category_counts.get(stat.category_id, 0) + stat.book_count
+        author_counts[stat.author_id] = author_counts.get(stat.author_id, 0) + stat.book_count
+
+    with transaction.atomic():
+        CategoryAuthorStat.objects.all().delete()
+        CategoryAuthorStat.objects.bulk_create(stats, batch_size=1000)
+        categories = list(Category.objects.only("id"))
+        for category in categories:
+            category.book_count = category_counts.get(category.id, 0)
+        Category.objects.bulk_update(categories, ["book_count"], batch_size=1000)
+        authors = list(Author.objects.only("id"))
+        for author in authors:
+            author.book_count = author_counts.get(author.id, 0)
+        Author.objects.bulk_update(authors, ["book_count"], batch_size=1000)
+    return len(stats)
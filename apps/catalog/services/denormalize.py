@@ -0,0 +1,44 @@
+"""Keep Book.author_name / category_name / category_slug / search_text in step with renames."""
+from __future__ import annotations
+
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Book, build_search_text
+
+BULK_BATCH = 500
+
+
+def sync_author_name(author) -> int:
+    """Bulk-update books whose copied author name is stale; a no-op for saves that keep the name."""
+    books = list(
+        Book.objects.filter(author_id=author.pk)
+        .exclude(author_name=author.name)
+        .only("id", "title", "category_name")
+    )
+    now = timezone.now()
+    for book in books:
+        book.author_name = author.name
+        book.search_text = build_search_text(book.title, author.name, book.category_name)
+        # bulk_update skips auto_now; the delta feed (api/books/changes/) selects by updated_at.
+        book.updated_at = now
+    Book.objects.bulk_update(books, ["author_name", "search_text", "updated_at"], batch_size=BULK_BATCH)
+    return len(books)
+
+
+def sync_category_name(category) -> int:
+    books = list(
+        Book.objects.filter(category_id=category.pk)
+        .exclude(Q(category_name=category.name) & Q(category_slug=category.slug))
+        .only("id", "title", "author_name")
+    )
+    now = timezone.now()
+    for book in books:
+        book.category_name = category.name
+        book.category_slug = category.slug
+        book.search_text = build_search_text(book.title, book.author_name, category.name)
+        book.updated_at = now
+    Book.objects.bulk_update(
+        books, ["category_name", "category_slug", "search_text", "updated_at"], batch_size=BULK_BATCH
+    )
+    return len(books)
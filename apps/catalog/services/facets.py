@@ -0,0 +1,248 @@
+"""
+Faceted filtering over precomputed bitmaps.
+
+Every facet value (an author, a category subtree, a price bucket, ...) owns a Python int whose
+bit i is set when the i-th book (by id) has that value. Filters are ANDs of ORed bitmaps and
+facet counts are popcounts, so each extra filter only shrinks the mask the counts run against.
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import namedtuple
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.core.cache import cache
+
+from ..cache_keys import facet_index_key, facet_index_stamp_key
+from ..models import Book
+from .category_tree import AuthorRef, get_category_tree
+
+FACET_INDEX_TTL = 60 * 60  # 1 hour; Book/Author/Category signals bump the stamp on every edit
+
+FACETS = ("author", "category", "format", "price", "pages", "in_stock")
+
+# (value, lower bound inclusive, upper bound exclusive or None), in display order.
+PRICE_BUCKETS = (
+    ("0-50000", 0, 50000),
+    ("50000-100000", 50000, 100000),
+    ("100000-200000", 100000, 200000),
+    ("200000-", 200000, None),
+)
+PAGE_BUCKETS = (
+    ("0-200", 0, 200),
+    ("200-400", 200, 400),
+    ("400-", 400, None),
+)
+IN_STOCK_LABELS = {"1": "Mavjud", "0": "Mavjud emas"}
+
+FacetValue = namedtuple("FacetValue", ["value", "label", "count"])
+FacetResult = namedtuple("FacetResult", ["mask", "count", "facets"])
+
+
+def _bucket(buckets, number) -> Optional[str]:
+    if number is None:
+        return None
+    for value, low, high in buckets:
+        if number >= low and (high is None or number < high):
+            return value
+    return None
+
+
+def _range_label(low, high, unit="") -> str:
+    def fmt(n):
+        return f"{n:,}".replace(",", " ")
+
+    label = f"{fmt(low)} – {fmt(high)}" if high is not None else f"{fmt(low)}+"
+    return f"{label} {unit}".strip()
+
+
+def _to_bitmap(positions: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for pos in positions:
+        bits[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(bits, "little")
+
+
+class FacetIndex:
+    def __init__(self, rows: List[Tuple], tree=None):
+        """rows: (id, category_id, author_id, author_name, book_format, sale_price, pages, stock_quantity) by id."""
+        tree = tree or get_category_tree()
+        self.ids: List[int] = [row[0] for row in rows]
+        self.position: Dict[int, int] = {book_id: pos for pos, book_id in enumerate(self.ids)}
+        self.all = (1 << len(self.ids)) - 1
+
+        positions: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        author_names: Dict[str, str] = {}
+        for pos, (_, category_id, author_id, author_name, book_format, price, pages, stock) in enumerate(rows):
+            author_names[str(author_id)] = author_name
+            values = {
+                "author": str(author_id),
+                "format": book_format or None,
+                "price": _bucket(PRICE_BUCKETS, price),
+                "pages": _bucket(PAGE_BUCKETS, pages),
+                "in_stock": "1" if stock else "0",
+            }
+            for facet, value in values.items():
+                if value is not None:
+                    positions[facet].setdefault(value, []).append(pos)
+            # A book counts towards its category and every ancestor, so selecting a
+            # parent category matches the whole subtree.
+            for cat_id in (category_id, *tree.ancestors.get(category_id, ())):
+                positions["category"].setdefault(str(cat_id), []).append(pos)
+
+        size = len(self.ids)
+        self.bitmaps: Dict[str, Dict[str, int]] = {
+            facet: {value: _to_bitmap(pos_list, size) for value, pos_list in by_value.items()}
+            for facet, by_value in positions.items()
+        }
+
+        format_labels = dict(Book.FORMAT_CHOICES)
+        self.labels: Dict[str, Dict[str, str]] = {
+            "author": author_names,
+            "category": {str(node.id): node.name for node in tree.nodes.values()},
+            "format": {value: format_labels.get(value, value) for value in self.bitmaps["format"]},
+            "price": {value: _range_label(low, high, "so‘m") for value, low, high in PRICE_BUCKETS},
+            "pages": {value: _range_label(low, high, "bet") for value, low, high in PAGE_BUCKETS},
+            "in_stock": IN_STOCK_LABELS,
+        }
+        # Buckets keep their natural order; authors/categories are listed by name.
+        self.order: Dict[str, Tuple[str, ...]] = {
+            "format": tuple(value for value, _ in Book.FORMAT_CHOICES),
+            "price": tuple(value for value, _, _ in PRICE_BUCKETS),
+            "pages": tuple(value for value, _, _ in PAGE_BUCKETS),
+            "in_stock": ("1", "0"),
+        }
+
+    def mask_for_ids(self, ids: Iterable[int]) -> int:
+        """Bitmap of the given book ids (e.g. a text-search hit list); unknown ids are ignored."""
+        return _to_bitmap((self.position[i] for i in ids if i in self.position), len(self.ids))
+
+    def ids_for(self, mask: int) -> List[int]:
+        """Book ids whose bits are set, ascending."""
+        if mask == self.all:
+            return list(self.ids)
+        data = mask.to_bytes((len(self.ids) + 7) // 8, "little")
+        ids = self.ids
+        return [ids[(i << 3) + bit] for i, byte in enumerate(data) if byte for bit in range(8) if byte >> bit & 1]
+
+    def filter_mask(self, facet: str, values: Iterable[str]) -> int:
+        """OR of the value bitmaps: several values of one facet widen the match."""
+        bitmaps = self.bitmaps.get(facet, {})
+        mask = 0
+        for value in values:
+            mask |= bitmaps.get(value, 0)
+        return mask
+
+    def search(self, filters: Mapping[str, Tuple[str, ...]], base: Optional[int] = None) -> FacetResult:
+        """
+        Apply filters (facet -> selected values) within base and count every facet value.
+        Counts for a facet ignore that facet's own selection, so the other choices stay visible.
+        """
+        base = self.all if base is None else base
+        masks = {facet: self.filter_mask(facet, values) for facet, values in filters.items() if values}
+        mask = base
+        for facet_mask in masks.values():
+            mask &= facet_mask
+
+        facets = {}
+        for facet in FACETS:
+            scope = base
+            for other, facet_mask in masks.items():
+                if other != facet:
+                    scope &= facet_mask
+            selected = set(filters.get(facet) or ())
+            counts = {}
+            for value, bitmap in self.bitmaps[facet].items():
+                n = (scope & bitmap).bit_count()
+                if n or value in selected:
+                    counts[value] = n
+            facets[facet] = self._facet_values(facet, counts)
+        return FacetResult(mask, mask.bit_count(), facets)
+
+    def _facet_values(self, facet: str, counts: Dict[str, int]) -> List[FacetValue]:
+        labels = self.labels[facet]
+        items = [FacetValue(value, labels.get(value, value), n) for value, n in counts.items()]
+        order = self.order.get(facet)
+        if order:
+            rank = {value: i for i, value in enumerate(order)}
+            items.sort(key=lambda item: rank.get(item.value, len(rank)))
+        else:
+            items.sort(key=lambda item: (item.label, item.value))
+        return items
+
+
+def parse_facet_filters(params: Mapping[str, str], facets: Iterable[str] = FACETS) -> Dict[str, Tuple[str, ...]]:
+    """
+    Read ?author=1,2&category=slug&price=0-50000... into facet -> values.
+    Categories may be given by id or slug; non-numeric author ids are ignored.
+    """
+    tree = None
+    filters = {}
+    for facet in facets:
+        raw = params.get(facet)
+        if not raw or raw in ("None", "null"):
+            continue
+        values = [value.strip() for value in raw.split(",") if value.strip()]
+        if facet == "author":
+            values = [value for value in values if value.isdecimal()]
+        elif facet == "category":
+            tree = tree or get_category_tree()
+            resolved = []
+            for value in values:
+                node = tree.get(int(value)) if value.isdecimal() else tree.get_by_slug(value)
+                resolved.append(str(node.id) if node is not None else value)
+            values = resolved
+        if values:
+            filters[facet] = tuple(values)
+    return filters
+
+
+def facet_authors(result: FacetResult) -> List[AuthorRef]:
+    """Author facet in the AuthorRef shape the filter sidebars render (id, name, book_count)."""
+    return [AuthorRef(int(item.value), item.label, item.count) for item in result.facets["author"]]
+
+
+def facets_json(result: FacetResult) -> Dict[str, list]:
+    return {
+        facet: [{"value": item.value, "label": item.label, "count": item.count} for item in items]
+        for facet, items in result.facets.items()
+    }
+
+
+def _build_index() -> FacetIndex:
+    rows = list(
+        Book.objects.order_by("id").values_list(
+            "id", "category_id", "author_id", "author_name", "book_format", "sale_price", "pages", "stock_quantity"
+        )
+    )
+    return FacetIndex(rows)
+
+
+_local_lock = threading.Lock()
+_local: Optional[Tuple[str, FacetIndex]] = None
+
+
+def get_facet_index() -> FacetIndex:
+    """
+    Shared index from the cache, memoized per process until the stamp changes, so a request
+    pays one small cache read instead of unpickling every bitmap.
+    """
+    global _local
+    stamp_key = facet_index_stamp_key()
+    stamp = cache.get(stamp_key)
+    if stamp is None:
+        cache.add(stamp_key, uuid.uuid4().hex[:12], None)
+        stamp = cache.get(stamp_key)
+    local = _local
+    if local is not None and local[0] == stamp:
+        return local[1]
+    index = cache.get_or_set(facet_index_key(stamp), _build_index, FACET_INDEX_TTL)
+    with _local_lock:
+        _local = (stamp, index)
+    return index
+
+
+def invalidate_facet_index() -> None:
+    """Called from Book/Author/Category signals."""
+    cache.set(facet_index_stamp_key(), uuid.uuid4().hex[:12], None)
@@ -0,0 +1,93 @@
+"""
+Home page book strips, rendered inline (the first INLINE_SECTIONS) or deferred to per-section
+fragment URLs so the home response does not grow with every FeaturedCategory.
+
+A deferred strip's URL carries a version built from its own stamp (bumped by the signals that
+change that strip) and the book fragment generation (author/category names, thumbnails), so the
+fragment can be page- and browser-cached for the strip's TTL and an edit simply points the
+home page at a new URL.
+"""
+from __future__ import annotations
+
+import hashlib
+import uuid
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from ..cache_keys import book_json_generation_key, home_section_version_key
+from .cached_queries import (
+    HOME_TTL,
+    LIST_TTL,
+    get_home_best_selling,
+    get_home_featured_books,
+    get_home_featured_cfgs,
+    get_home_new_books,
+    get_home_recommended,
+)
+
+INLINE_SECTIONS = 1  # strips rendered with the page; the rest load as the visitor scrolls
+SECTION_TEMPLATE = "includes/home_section.html"
+
+# key: "featured-<FeaturedCategory id>", "new", "best-selling" or "recommended"
+HomeSection = namedtuple("HomeSection", "key title link ttl")
+
+FIXED_SECTIONS = (
+    ("new", "Yangi qo‘shilganlar", "new_books_list", HOME_TTL, get_home_new_books),
+    ("best-selling", "Eng ko‘p sotilganlar", "best_selling_list", LIST_TTL, get_home_best_selling),
+    ("recommended", "Tavsiya etilganlar", "recommended_list", LIST_TTL, get_home_recommended),
+)
+_FIXED_LOADERS = {key: loader for key, _, _, _, loader in FIXED_SECTIONS}
+
+
+def featured_section_key(cfg_id: int) -> str:
+    return f"featured-{cfg_id}"
+
+
+def home_sections(lang) -> List[HomeSection]:
+    """All strips in page order: featured categories first, then the fixed lists."""
+    sections = [
+        HomeSection(
+            featured_section_key(cfg.id),
+            cfg.title or cfg.category.name,
+            reverse("category_detail", args=[cfg.category.slug]),
+            HOME_TTL,
+        )
+        for cfg in get_home_featured_cfgs(lang)
+    ]
+    sections += [HomeSection(key, title, reverse(url_name), ttl) for key, title, url_name, ttl, _ in FIXED_SECTIONS]
+    return sections
+
+
+def get_home_section(key: str, lang) -> Optional[HomeSection]:
+    return next((section for section in home_sections(lang) if section.key == key), None)
+
+
+def section_books(key: str, lang) -> list:
+    if key in _FIXED_LOADERS:
+        return _FIXED_LOADERS[key](lang)
+    cfg = next((cfg for cfg in get_home_featured_cfgs(lang) if featured_section_key(cfg.id) == key), None)
+    return get_home_featured_books(cfg, lang) if cfg is not None else []
+
+
+def section_versions(keys: List[str]) -> Dict[str, str]:
+    """Current URL version per section, read in one cache round trip."""
+    generation_key = book_json_generation_key()
+    version_keys = {key: home_section_version_key(key) for key in keys}
+    stamps = cache.get_many([generation_key, *version_keys.values()])
+    # Same rule as the book stamps: a missing stamp gets a fresh token, never a constant.
+    new_stamps = {k: uuid.uuid4().hex[:12] for k in [generation_key, *version_keys.values()] if k not in stamps}
+    if new_stamps:
+        cache.set_many(new_stamps, None)
+        stamps.update(new_stamps)
+    generation = stamps[generation_key]
+    return {
+        key: hashlib.md5(f"{stamps[version_key]}:{generation}".encode()).hexdigest()[:12]
+        for key, version_key in version_keys.items()
+    }
+
+
+def bump_home_sections(keys) -> None:
+    cache.set_many({home_section_version_key(key): uuid.uuid4().hex[:12] for key in keys}, None)
@@ -0,0 +1,81 @@
+"""
+Garbage collection for MEDIA_ROOT: uploads and derived images no row references any more.
+
+With content-addressed uploads (config.storage) replaced covers and banners are left behind
+instead of overwritten; their thumbnails and on-demand resizes go with them.
+Snapshots prune themselves and are not touched here.
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Iterator, Set
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import FileField
+
+from config.db_router import use_primary
+
+from .resize import RESIZED_DIR
+from .thumbnails import THUMBNAIL_DIR
+
+UPLOAD_DIRS = ("covers", "authors", "banners", "about")
+THUMBNAIL_RE = re.compile(rf"^{THUMBNAIL_DIR}/(?P<stem>.+)-\d+w\.[a-z]+$")
+RESIZED_RE = re.compile(rf"^{RESIZED_DIR}/\d+x\d+/(?P<name>.+)$")
+
+GcResult = namedtuple("GcResult", ["scanned", "removed", "freed_bytes"])
+
+
+def referenced_names() -> Set[str]:
+    """Every value of every FileField/ImageField column, read from the primary."""
+    names = set()
+    with use_primary():
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, FileField):
+                    qs = model._default_manager.exclude(**{field.attname: ""}).exclude(**{f"{field.attname}__isnull": True})
+                    names.update(qs.values_list(field.attname, flat=True).iterator())
+    return names
+
+
+def _media_files(root: Path) -> Iterator[Path]:
+    for directory in (*UPLOAD_DIRS, THUMBNAIL_DIR, RESIZED_DIR):
+        base = root / directory
+        if base.is_dir():
+            yield from (path for path in base.rglob("*") if path.is_file())
+
+
+def collect_garbage(min_age: float = 24 * 60 * 60, dry_run: bool = False, log=None) -> GcResult:
+    """
+    Delete unreferenced files older than `min_age` seconds; the grace period keeps uploads
+    whose row has not been committed yet. `log(name, size)` is called for each removed file.
+    """
+    root = Path(settings.MEDIA_ROOT)
+    referenced = referenced_names()
+    stems = {name.rsplit(".", 1)[0] for name in referenced}
+    cutoff = time.time() - min_age
+    scanned = removed = freed = 0
+    for path in _media_files(root):
+        scanned += 1
+        name = path.relative_to(root).as_posix()
+        thumb = THUMBNAIL_RE.match(name)
+        resized = RESIZED_RE.match(name)
+        if thumb:
+            keep = thumb.group("stem") in stems
+        elif resized:
+            keep = resized.group("name") in referenced
+        else:
+            keep = name in referenced
+        stat = path.stat()
+        if keep or stat.st_mtime > cutoff:
+            continue
+        removed += 1
+        freed += stat.st_size
+        if log is not None:
+            log(name, stat.st_size)
+        if not dry_run:
+            path.unlink(missing_ok=True)
+    return GcResult(scanned, removed, freed)
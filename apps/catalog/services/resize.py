@@ -0,0 +1,119 @@
+"""
+On-demand image resizes for /media/resized/<w>x<h>/<path>.
+
+The first request for a size renders it in a small thread pool and writes it to the same path
+under MEDIA_ROOT, so Apache (media.conf) serves every later request without reaching Django.
+Only sizes listed in IMAGE_RESIZE_SIZES are accepted; anything else would let a client fill
+the disk with arbitrary variants.
+"""
+from __future__ import annotations
+
+import os
+import posixpath
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+RESIZED_DIR = "resized"
+SOURCE_EXTENSIONS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".webp": "WEBP"}
+# Generated trees are never resized again: that would multiply variants of variants.
+EXCLUDED_PREFIXES = (f"{RESIZED_DIR}/", "thumbs/", "snapshots/")
+SAVE_OPTIONS = {
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 80, "method": 6},
+}
+RESIZE_TIMEOUT = 15  # seconds a request waits for its variant
+
+
+class ResizeBusy(Exception):
+    """Too many resizes queued; the client should retry shortly."""
+
+
+def allowed_sizes():
+    return {tuple(int(n) for n in size.lower().split("x")) for size in settings.IMAGE_RESIZE_SIZES}
+
+
+def resized_url(name: str, width: int, height: int) -> str:
+    return f"{settings.MEDIA_URL}{RESIZED_DIR}/{width}x{height}/{name}"
+
+
+def source_path(name: str) -> Optional[Path]:
+    """Absolute path of an original under MEDIA_ROOT, or None if the name is not resizable."""
+    name = posixpath.normpath(name)
+    if name.startswith(("/", "../")) or name == ".." or name.startswith(EXCLUDED_PREFIXES):
+        return None
+    if posixpath.splitext(name)[1].lower() not in SOURCE_EXTENSIONS:
+        return None
+    root = Path(settings.MEDIA_ROOT).resolve()
+    path = (root / name).resolve()
+    if root not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+def target_path(name: str, width: int, height: int) -> Path:
+    return Path(settings.MEDIA_ROOT) / RESIZED_DIR / f"{width}x{height}" / posixpath.normpath(name)
+
+
+def render(source: Path, target: Path, width: int, height: int) -> Path:
+    """
+    Crop-to-fill `source` into width x height (center crop, no upscaling: a smaller original
+    gives the largest box of the same aspect that fits it) and write `target` atomically.
+    """
+    if target.is_file():
+        return target
+    pil_format = SOURCE_EXTENSIONS[source.suffix.lower()]
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        scale = min(1.0, image.width / width, image.height / height)
+        box = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if pil_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        resized = ImageOps.fit(image, box, Image.LANCZOS)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{threading.get_ident()}.tmp")
+    resized.save(tmp, pil_format, **SAVE_OPTIONS[pil_format])
+    os.replace(tmp, target)
+    return target
+
+
+_pool_lock = threading.RLock()  # a finished job's done-callback can run inside the lock
+_pool: Optional[ThreadPoolExecutor] = None
+_inflight: Dict[Path, Future] = {}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=settings.IMAGE_RESIZE_WORKERS, thread_name_prefix="resize")
+    return _pool
+
+
+def resize(source: Path, target: Path, width: int, height: int) -> Path:
+    """
+    Render one variant in the shared pool. Concurrent requests for the same file wait on the
+    same job; ResizeBusy is raised when IMAGE_RESIZE_MAX_PENDING jobs are already queued.
+    """
+    with _pool_lock:
+        future = _inflight.get(target)
+        if future is None:
+            if len(_inflight) >= settings.IMAGE_RESIZE_MAX_PENDING:
+                raise ResizeBusy()
+            future = _get_pool().submit(render, source, target, width, height)
+            _inflight[target] = future
+            future.add_done_callback(lambda _, target=target: _forget(target))
+    try:
+        return future.result(timeout=RESIZE_TIMEOUT)
+    except FutureTimeout:
+        raise ResizeBusy() from None
+
+
+def _forget(target: Path) -> None:
+    with _pool_lock:
+        _inflight.pop(target, None)
@@ -0,0 +1,123 @@
+"""Versioned, gzip-compressed full-catalog snapshot written under MEDIA_ROOT for app cold starts."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.utils import timezone
+
+from ..models import Author, Book
+from ..serializers import serialize_author, serialize_book, serialize_category_node
+from .category_tree import get_category_tree
+from .sync import SYNC_OVERLAP, encode_token
+from .warmup import default_base_url
+
+logger = logging.getLogger("django")
+
+SNAPSHOT_DIR = "snapshots"
+MANIFEST_NAME = "catalog-latest.json"
+KEEP_SNAPSHOTS = 3
+REBUILD_DELAY = 60  # seconds; a burst of admin edits produces one rebuild
+
+_timer_lock = threading.Lock()
+_timer: Optional[threading.Timer] = None
+
+
+class _BaseUrlRequest:
+    """Just enough of HttpRequest for the serializers' absolute media URLs."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def build_absolute_uri(self, location: str) -> str:
+        return f"{self.base_url}{location}"
+
+
+def _snapshot_root() -> Path:
+    return Path(settings.MEDIA_ROOT) / SNAPSHOT_DIR
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def build_snapshot(base_url: Optional[str] = None) -> dict:
+    """
+    Serialize every book, author and the category tree, write catalog-<hash>.json.gz and
+    point catalog-latest.json at it. Identical content keeps the same file, so clients and
+    CDNs can cache snapshot files forever. The manifest carries a delta-sync token.
+    """
+    started = timezone.now()
+    request = _BaseUrlRequest(base_url or default_base_url())
+    books = Book.objects.order_by("id").iterator(chunk_size=2000)
+    payload = {
+        "books": [serialize_book(request, book) for book in books],
+        "authors": [serialize_author(request, author) for author in Author.objects.order_by("id")],
+        "categories": [serialize_category_node(root) for root in get_category_tree().roots],
+    }
+    raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    version = hashlib.sha256(raw).hexdigest()[:16]
+
+    root = _snapshot_root()
+    root.mkdir(parents=True, exist_ok=True)
+    name = f"catalog-{version}.json.gz"
+    path = root / name
+    if not path.exists():
+        # mtime=0 keeps the gzip bytes deterministic for identical JSON.
+        _write_atomic(path, gzip.compress(raw, compresslevel=9, mtime=0))
+    else:
+        path.touch()  # keep the live file newest so cleanup below never picks it
+
+    manifest = {
+        "version": version,
+        "url": f"{settings.MEDIA_URL}{SNAPSHOT_DIR}/{name}",
+        "size": path.stat().st_size,
+        "raw_size": len(raw),
+        "books": len(payload["books"]),
+        "generated_at": started.isoformat(),
+        # Continue with api/books/changes/?since=<token> after loading the snapshot.
+        "token": encode_token(started - SYNC_OVERLAP),
+    }
+    _write_atomic(root / MANIFEST_NAME, json.dumps(manifest).encode("utf-8"))
+
+    old = sorted(root.glob("catalog-*.json.gz"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in old[KEEP_SNAPSHOTS:]:
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return manifest
+
+
+def _run_rebuild() -> None:
+    global _timer
+    with _timer_lock:
+        _timer = None
+    try:
+        build_snapshot()
+    except Exception:
+        logger.exception("catalog snapshot rebuild failed")
+    finally:
+        connections.close_all()
+
+
+def schedule_snapshot_rebuild() -> None:
+    """Debounced background rebuild triggered by catalog signals (per process)."""
+    global _timer
+    if not getattr(settings, "CATALOG_SNAPSHOT_AUTO_REBUILD", False):
+        return
+    with _timer_lock:
+        if _timer is not None:
+            return
+        _timer = threading.Timer(REBUILD_DELAY, _run_rebuild)
+        _timer.daemon = True
+        _timer.start()
@@ -0,0 +1,77 @@
+"""
+Streamed listing pages: the page around the book grid goes out first, the cards follow in chunks.
+
+The view renders the full template eagerly with only the first STREAM_FIRST books (CSRF cookie,
+session and context processors behave as for render()); the template marks the end of the grid
+with {{ stream_slot }}, and the remaining books are pulled from the iterator and rendered with
+includes/book_grid.html while the response is being sent. Responses stay compatible with
+GZipMiddleware (compressed per chunk) and with compressed_cache_page, which stores the joined
+body once the stream completes.
+"""
+from __future__ import annotations
+
+import contextvars
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from ..models import Book
+
+STREAM_FIRST = 12  # above the fold on desktop (3 rows of 4); enough to fill a phone screen
+STREAM_CHUNK = 48  # books per later chunk and per DB round trip
+
+STREAM_SLOT = "<!--book-grid-stream-->"
+GRID_TEMPLATE = "includes/book_grid.html"
+
+
+def books_in_order(ids: List[int], chunk_size: int = STREAM_CHUNK) -> Iterator[Book]:
+    """Lazily hydrate an ordered id list (catalog index) one chunk at a time."""
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        found = Book.objects.in_bulk(chunk)
+        yield from (found[i] for i in chunk if i in found)
+
+
+def _grid_chunks(books: Iterator) -> Iterator[str]:
+    while True:
+        chunk = list(islice(books, STREAM_CHUNK))
+        if not chunk:
+            return
+        yield render_to_string(GRID_TEMPLATE, {"books": chunk})
+
+
+def stream_listing(request, template_name: str, context: dict, books: Iterable) -> StreamingHttpResponse:
+    """
+    StreamingHttpResponse for a listing template that includes the book grid followed by
+    {{ stream_slot }}. Pass querysets as qs.iterator(chunk_size=STREAM_CHUNK) so rows are
+    fetched as the page goes out instead of all at once.
+    """
+    books = iter(books)
+    first = list(islice(books, STREAM_FIRST))
+    page = render_to_string(
+        template_name,
+        {**context, "books": first, "stream_slot": mark_safe(STREAM_SLOT) if first else ""},
+        request,
+    )
+    if not first:
+        return StreamingHttpResponse(iter([page]))
+    head, tail = page.split(STREAM_SLOT, 1)
+
+    # The rest is rendered after the middleware chain has returned; run it in the view's
+    # context so a request pinned to the primary (ReplicaPinningMiddleware) stays pinned.
+    context_snapshot = contextvars.copy_context()
+    chunks = _grid_chunks(books)
+
+    def content():
+        yield head
+        while True:
+            try:
+                yield context_snapshot.run(next, chunks)
+            except StopIteration:
+                break
+        yield tail
+
+    return StreamingHttpResponse(content())
@@ -0,0 +1,100 @@
+"""Delta-sync helpers: opaque sync tokens and change collection for mobile catalog replicas."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional, Tuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Author, Book, CatalogTombstone, Category
+
+SYNC_BATCH_LIMIT = 500
+# Rows committed slightly after "now" by a concurrent transaction may carry an older timestamp.
+# Re-sending the last few seconds on the next poll is harmless because clients upsert by id.
+SYNC_OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_token(ts: datetime, last_id: int = 0) -> str:
+    return f"{int(ts.timestamp() * 1_000_000)}-{last_id}"
+
+
+def decode_token(token: str) -> Tuple[datetime, int]:
+    try:
+        micros, last_id = token.split("-", 1)
+        ts = datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+        return ts, int(last_id)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise InvalidSyncToken(token)
+
+
+def prune_tombstones() -> None:
+    CatalogTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+
+
+def record_tombstone(kind: str, object_id: int) -> None:
+    CatalogTombstone.objects.create(kind=kind, object_id=object_id)
+
+
+def collect_changes(token: Optional[str], limit: int = SYNC_BATCH_LIMIT) -> dict:
+    """
+    Return rows changed since token plus the next token.
+    Books are paged with an (updated_at, id) cursor; authors, categories and tombstones are
+    small and returned for the whole window. Without a token (or with one older than the
+    tombstone retention) the client must rebuild its replica from scratch: reset=True.
+    """
+    now = timezone.now()
+    since = None
+    since_id = 0
+    reset = False
+    if token:
+        since, since_id = decode_token(token)
+        if since < now - TOMBSTONE_RETENTION:
+            since, since_id, reset = None, 0, True
+    else:
+        reset = True
+
+    books = Book.objects.filter(updated_at__lt=now)
+    if since is not None:
+        books = books.filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=since_id))
+    books = list(books.order_by("updated_at", "id")[: limit + 1])
+    has_more = len(books) > limit
+    if has_more:
+        books = books[:limit]
+        window_end = books[-1].updated_at
+        next_token = encode_token(window_end, books[-1].id)
+    else:
+        window_end = now
+        next_token = encode_token(now - SYNC_OVERLAP)
+
+    window = Q(updated_at__lte=window_end) if has_more else Q(updated_at__lt=now)
+    if since is not None:
+        window &= Q(updated_at__gte=since)
+    authors = list(Author.objects.filter(window).order_by("updated_at", "id"))
+    categories = list(Category.objects.filter(window).order_by("updated_at", "id"))
+
+    deleted = {"books": [], "authors": [], "categories": []}
+    if since is not None:
+        tombstones = CatalogTombstone.objects.filter(deleted_at__gte=since, deleted_at__lte=window_end)
+        plural = {
+            CatalogTombstone.KIND_BOOK: "books",
+            CatalogTombstone.KIND_AUTHOR: "authors",
+            CatalogTombstone.KIND_CATEGORY: "categories",
+        }
+        for kind, object_id in tombstones.values_list("kind", "object_id"):
+            deleted[plural[kind]].append(object_id)
+
+    return {
+        "token": next_token,
+        "reset": reset,
+        "has_more": has_more,
+        "books": books,
+        "authors": authors,
+        "categories": categories,
+        "deleted": deleted,
+    }
@@ -0,0 +1,192 @@
+"""
+Fixed-width JPEG and WebP variants of uploaded catalog images, for srcset.
+
+Variants are written to thumbs/<original name>-<width>w.<ext> in the image's storage when
+the image is saved (signals) or by the build_thumbnails command. The original's size, its
+average colour and a tiny blurred preview (LQIP) are stored on the row, so templates and the
+API derive every variant URL and paint a placeholder without I/O.
+"""
+from __future__ import annotations
+
+import base64
+import logging
+import posixpath
+from collections import namedtuple
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageFilter, ImageOps
+
+from ..models import Author, Banner, Book
+from .book_json import bump_book_json_generation, bump_book_version
+
+logger = logging.getLogger("django")
+
+THUMBNAIL_DIR = "thumbs"
+
+ImageSpec = namedtuple("ImageSpec", ["field", "width", "height", "color", "placeholder", "kind"])
+
+IMAGE_FIELDS = {
+    Book: ImageSpec("cover_image", "cover_width", "cover_height", "cover_color", "cover_placeholder", "cover"),
+    Author: ImageSpec("photo", "photo_width", "photo_height", "photo_color", "photo_placeholder", "photo"),
+    Banner: ImageSpec("image", "image_width", "image_height", "image_color", "image_placeholder", "banner"),
+}
+
+# Target widths per kind: 1x/2x of the card, strip, chip and hero slots in the templates.
+WIDTHS = {
+    "cover": (160, 320, 640),
+    "photo": (96, 192),
+    "banner": (480, 960, 1600),
+}
+
+# (extension, PIL format, save options)
+FORMATS = (
+    ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+    ("webp", "WEBP", {"quality": 80, "method": 6}),
+)
+
+PLACEHOLDER_SIZE = 16  # px on the long side; ~100-300 bytes as WebP
+PLACEHOLDER_QUALITY = 40
+
+Thumbnail = namedtuple("Thumbnail", ["width", "height", "jpeg", "webp"])  # jpeg/webp are storage names
+Placeholder = namedtuple("Placeholder", ["color", "data_uri"])
+
+
+def variant_widths(kind: str, width: Optional[int]) -> List[int]:
+    """
+    Widths generated for an original `width` px wide: every target below it, plus the original
+    width itself when it is no wider than the largest target. Originals are never upscaled.
+    """
+    if not width:
+        return []
+    targets = WIDTHS[kind]
+    widths = [w for w in targets if w < width]
+    if width <= targets[-1]:
+        widths.append(width)
+    return widths
+
+
+def variant_name(name: str, width: int, ext: str) -> str:
+    stem = posixpath.splitext(name)[0]
+    return f"{THUMBNAIL_DIR}/{stem}-{width}w.{ext}"
+
+
+def thumbnails_for(name: str, kind: str, width: Optional[int], height: Optional[int]) -> List[Thumbnail]:
+    """Variants of a stored image, smallest first; empty until the image has been processed."""
+    if not name or not width or not height:
+        return []
+    return [
+        Thumbnail(w, max(1, round(height * w / width)), variant_name(name, w, "jpg"), variant_name(name, w, "webp"))
+        for w in variant_widths(kind, width)
+    ]
+
+
+def instance_thumbnails(instance) -> Tuple[List[Thumbnail], Optional[int], Optional[int]]:
+    """(variants, original width, original height) for a Book, Author or Banner."""
+    spec = IMAGE_FIELDS[type(instance)]
+    field = getattr(instance, spec.field)
+    width, height = getattr(instance, spec.width), getattr(instance, spec.height)
+    return thumbnails_for(field.name if field else "", spec.kind, width, height), width, height
+
+
+def instance_placeholder(instance) -> Optional[Placeholder]:
+    """Stored average colour and blurred preview, or None until the image has been processed."""
+    spec = IMAGE_FIELDS[type(instance)]
+    color = getattr(instance, spec.color)
+    if not color or not getattr(instance, spec.field):
+        return None
+    return Placeholder(color, getattr(instance, spec.placeholder))
+
+
+def make_placeholder(image: Image.Image) -> Placeholder:
+    """Average colour as #rrggbb plus a ~16px blurred WebP data URI, for painting before the real image."""
+    r, g, b = image.resize((1, 1), Image.BOX).getpixel((0, 0))[:3]
+    preview = image.copy()
+    preview.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.BOX)
+    preview = preview.filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    preview.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    data = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return Placeholder(f"#{r:02x}{g:02x}{b:02x}", f"data:image/webp;base64,{data}")
+
+
+def _open_rgb(field) -> Image.Image:
+    field.open("rb")
+    try:
+        image = Image.open(field)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    finally:
+        field.close()
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        # JPEG has no alpha; flatten transparent PNGs onto white instead of black.
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def generate_thumbnails(field, kind: str) -> Tuple[int, int, Placeholder]:
+    """Write every variant of an image field; returns the original's (width, height, placeholder)."""
+    image = _open_rgb(field)
+    width, height = image.size
+    storage = field.storage
+    for w in variant_widths(kind, width):
+        resized = image if w == width else image.resize((w, max(1, round(height * w / width))), Image.LANCZOS)
+        for ext, pil_format, options in FORMATS:
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **options)
+            name = variant_name(field.name, w, ext)
+            # Storage.save() renames on collision; the URL must stay derivable from the original.
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return width, height, make_placeholder(image)
+
+
+def ensure_thumbnails(instance, force: bool = False) -> bool:
+    """
+    Generate variants for a Book/Author/Banner image if they are missing or the image changed,
+    and store the original size and placeholder on the row. Returns True when anything was written.
+    """
+    spec = IMAGE_FIELDS[type(instance)]
+    field = getattr(instance, spec.field)
+    width = getattr(instance, spec.width)
+
+    if not field:
+        if width is not None:
+            _store(instance, spec, {spec.width: None, spec.height: None, spec.color: "", spec.placeholder: ""})
+        return False
+
+    if not force and width and getattr(instance, spec.color):
+        # A new upload gets a new name, so the largest variant of the current name is the marker.
+        largest = variant_widths(spec.kind, width)[-1]
+        if field.storage.exists(variant_name(field.name, largest, "webp")):
+            return False
+
+    try:
+        width, height, placeholder = generate_thumbnails(field, spec.kind)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        # Missing files and non-images keep serving the original; the page must still render.
+        logger.warning("thumbnails: could not process %s", field.name, exc_info=True)
+        return False
+    _store(
+        instance,
+        spec,
+        {spec.width: width, spec.height: height, spec.color: placeholder.color, spec.placeholder: placeholder.data_uri},
+    )
+    return True
+
+
+def _store(instance, spec: ImageSpec, values: dict) -> None:
+    # .update() skips save(): no updated_at bump and no second round of catalog signals.
+    type(instance)._default_manager.filter(pk=instance.pk).update(**values)
+    for name, value in values.items():
+        setattr(instance, name, value)
+    # Cards and JSON cached before the sizes landed would keep serving without srcset.
+    if isinstance(instance, Book):
+        bump_book_version(instance.pk)
+    elif isinstance(instance, Author):
+        bump_book_json_generation()
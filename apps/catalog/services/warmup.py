@@ -0,0 +1,216 @@
+"""Cache warm-up helpers: data caches, compiled templates and the page cache."""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.test import Client
+from django.urls import reverse
+from django.utils import translation
+
+from ..models import Category
+from .cached_queries import (
+    get_best_selling_list,
+    get_home_data,
+    get_nav_categories,
+    get_recommended_list,
+    get_top_categories,
+)
+
+logger = logging.getLogger("django")
+
+# Public, anonymous pages that sit behind cache_page and are hit first after a restart.
+DEFAULT_URL_NAMES = [
+    "home",
+    "categories_list",
+    "authors_list",
+    "about",
+    "new_books_list",
+    "best_selling_list",
+    "recommended_list",
+    "api_home",
+    "api_categories",
+    "api_authors",
+    "api_books",
+    "api_about",
+]
+
+# Paths that are per-user, write-only or served outside Django; never replay them.
+SKIP_PREFIXES = (
+    "/admin/",
+    "/account/",
+    "/static/",
+    "/media/",
+    "/savat/",
+    "/buyurtma/",
+    "/sevimlilar/",
+    "/api/cart/",
+    "/api/orders/",
+    "/api/delivery-quote/",
+)
+
+_ACCESS_LOG_RE = re.compile(r'"GET (?P<path>\S+) HTTP/[\d.]+" (?P<status>\d{3}) ')
+
+
+def default_base_url() -> str:
+    """
+    Build the base URL used for page cache keys.
+    cache_page keys include scheme and host, so warming must use the public host, not "testserver".
+    """
+    configured = getattr(settings, "CACHE_WARMUP_BASE_URL", "")
+    if configured:
+        return configured.rstrip("/")
+    hosts = [h for h in settings.ALLOWED_HOSTS if h and h != "*" and not h.startswith(".")]
+    public = [h for h in hosts if h not in {"127.0.0.1", "localhost"}]
+    host = (public or hosts or ["localhost"])[0]
+    scheme = "https" if getattr(settings, "SECURE_SSL_REDIRECT", False) else "http"
+    return f"{scheme}://{host}"
+
+
+def default_urls() -> List[str]:
+    """Named public pages plus every top-level category page."""
+    urls = [reverse(name) for name in DEFAULT_URL_NAMES]
+    for slug in Category.objects.filter(parent__isnull=True).values_list("slug", flat=True):
+        urls.append(reverse("category_detail", args=[slug]))
+    return urls
+
+
+def urls_from_file(path: str) -> List[str]:
+    """Read one path per line; blank lines and '#' comments are ignored."""
+    urls = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                urls.append(line)
+    return urls
+
+
+def urls_from_access_log(path: str, limit: int = 50) -> List[str]:
+    """
+    Return the most requested successful GET paths from an Apache/Passenger access log.
+    Per-user and non-Django paths are skipped so warming never replays private pages.
+    """
+    counter: Counter = Counter()
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            match = _ACCESS_LOG_RE.search(line)
+            if not match or match.group("status") != "200":
+                continue
+            url = match.group("path")
+            if url.startswith(SKIP_PREFIXES):
+                continue
+            counter[url] += 1
+    return [url for url, _ in counter.most_common(limit)]
+
+
+def warm_data_caches(langs: Iterable[str]) -> None:
+    """Fill the cache_keys.py entries that HTML and API views read on every miss."""
+    for lang in langs:
+        with translation.override(lang):
+            get_home_data(lang)
+            get_top_categories(lang)
+            get_nav_categories(lang)
+            get_best_selling_list(lang)
+            get_recommended_list(lang)
+
+
+def preload_templates() -> int:
+    """
+    Compile every project template so the cached loader holds them before the first request.
+    Only configured DIRS are walked; admin templates are left to load lazily.
+    """
+    loaded = 0
+    for engine in engines.all():
+        for directory in engine.dirs:
+            root = Path(directory)
+            for path in sorted(root.rglob("*.html")):
+                name = path.relative_to(root).as_posix()
+                try:
+                    engine.get_template(name)
+                except (TemplateDoesNotExist, TemplateSyntaxError) as exc:
+                    logger.warning("warm_cache: template %s failed to load: %s", name, exc)
+                    continue
+                loaded += 1
+    return loaded
+
+
+def _fetch(url: str, host: str, secure: bool) -> Tuple[str, Optional[int], float]:
+    client = Client(raise_request_exception=False)
+    started = time.monotonic()
+    try:
+        response = client.get(url, secure=secure, HTTP_HOST=host)
+        status = response.status_code
+    except Exception:
+        logger.exception("warm_cache: request to %s failed", url)
+        status = None
+    finally:
+        # Worker threads open their own DB connections; release them before the thread is reused.
+        connections.close_all()
+    return url, status, time.monotonic() - started
+
+
+def warm_urls(urls: Iterable[str], base_url: Optional[str] = None, workers: int = 4) -> List[Tuple[str, Optional[int], float]]:
+    """Request each URL in-process in parallel so cache_page stores the rendered responses."""
+    parsed = urlparse(base_url or default_base_url())
+    host = parsed.netloc
+    secure = parsed.scheme == "https"
+    unique = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(lambda url: _fetch(url, host, secure), unique))
+
+
+def collect_urls(urls_file: Optional[str] = None, access_log: Optional[str] = None, top: int = 50) -> List[str]:
+    urls = default_urls()
+    if urls_file:
+        urls += urls_from_file(urls_file)
+    if access_log:
+        urls += urls_from_access_log(access_log, limit=top)
+    return list(dict.fromkeys(urls))
+
+
+def warm_all(workers: Optional[int] = None) -> None:
+    """Run templates, data caches and page cache warm-up using settings defaults."""
+    started = time.monotonic()
+    templates = preload_templates()
+    warm_data_caches([settings.LANGUAGE_CODE])
+    urls = collect_urls(
+        urls_file=getattr(settings, "CACHE_WARMUP_URLS_FILE", "") or None,
+        access_log=getattr(settings, "CACHE_WARMUP_ACCESS_LOG", "") or None,
+    )
+    results = warm_urls(urls, workers=workers or getattr(settings, "CACHE_WARMUP_WORKERS", 4))
+    failed = [url for url, status, _ in results if status != 200]
+    logger.info(
+        "warm_cache: %s templates, %s urls (%s failed) in %.2fs",
+        templates,
+        len(results),
+        len(failed),
+        time.monotonic() - started,
+    )
+
+
+def warm_on_boot() -> None:
+    """
+    Warm the current worker in a background thread when CACHE_WARMUP_ON_BOOT is enabled.
+    Locmem caches are per process, so each Passenger/gunicorn worker has to warm itself.
+    """
+    if not getattr(settings, "CACHE_WARMUP_ON_BOOT", False):
+        return
+
+    def _run():
+        try:
+            warm_all()
+        except Exception:
+            logger.exception("warm_cache: boot warm-up failed")
+
+    threading.Thread(target=_run, name="cache-warmup", daemon=True).start()
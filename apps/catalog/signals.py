@@ -1,10 +1,12 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.core.cache import cache
 from django.utils.translation import get_language
 from django.conf import settings
 
-from .models import Book, Category, Author, Banner, FeaturedCategory
+from config.db_router import mark_catalog_write
+
+from .models import Book, Category, Author, Banner, FeaturedCategory, AboutPage, CatalogTombstone
 from .cache_keys import (
     language_codes,
     home_top_categories_key,
@@ -17,14 +19,27 @@ from .cache_keys import (
     home_recommended_key,
     best_selling_list_key,
     recommended_list_key,
-    categories_top_key,
-    nav_categories_key,
 )
+from .services.book_json import bump_book_json_generation, bump_book_version
+from .services.catalog_index import log_book_change
+from .services.category_tree import invalidate_category_tree
+from .services.conditional import bump_catalog_state
+from .services.counters import refresh_book_counters
+from .services.denormalize import sync_author_name, sync_category_name
+from .services.facets import invalidate_facet_index
+from .services.home_sections import bump_home_sections, featured_section_key
+from .services.snapshot import schedule_snapshot_rebuild
+from .services.sync import prune_tombstones, record_tombstone
+from .services.thumbnails import ensure_thumbnails
 
 
 def _invalidate_keys(keys):
     """Delete multiple cache keys if they exist."""
     cache.delete_many([k for k in keys if k])
+    # Every catalog change also retires API ETags so polling clients refetch.
+    bump_catalog_state()
+    # Keep catalog reads (and the cache rebuilds they trigger) off a lagging replica for a moment.
+    mark_catalog_write()
 
 
 def _home_featured_books_keys_for_all_languages():
@@ -42,29 +57,59 @@ def _home_featured_books_keys_for_all_languages():
     return keys
 
 
+# Registered before the cache handlers below so they never rebuild from stale names.
+@receiver(post_save, sender=Category)
+def sync_category_copies(sender, instance, **kwargs):
+    """
+    Books carry copies of their category name/slug; rewrite them when the category is renamed.
+    """
+    sync_category_name(instance)
+
+
+@receiver(post_save, sender=Author)
+def sync_author_copies(sender, instance, **kwargs):
+    """
+    Books carry a copy of the author name; rewrite it when the author is renamed.
+    """
+    sync_author_name(instance)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Banner)
+def build_image_thumbnails(sender, instance, raw=False, **kwargs):
+    """
+    Generate srcset variants when an image is uploaded or replaced, before caches are rebuilt.
+    """
+    if not raw:
+        ensure_thumbnails(instance)
+
+
 @receiver([post_save, post_delete], sender=Category)
 def invalidate_category_caches(sender, instance, **kwargs):
     """
     Category changes impact nav menu, category listings, and home top categories.
     We clear only those keys so pages refresh immediately; TTL alone would delay updates.
     """
-    keys = []
-    for lang in language_codes():
-        keys += [
-            nav_categories_key(lang),
-            categories_top_key(lang),
-            home_top_categories_key(lang),
-        ]
+    keys = [home_top_categories_key(lang) for lang in language_codes()]
     _invalidate_keys(keys)
+    invalidate_category_tree()
+    invalidate_facet_index()
+    bump_book_json_generation()
+    schedule_snapshot_rebuild()
 
 
 @receiver([post_save, post_delete], sender=Author)
 def invalidate_author_caches(sender, instance, **kwargs):
     """
-    Author changes affect featured authors on the home page.
+    Author changes affect featured authors on the home page and the category sidebars.
     """
     keys = [home_featured_authors_key(lang) for lang in language_codes()]
     _invalidate_keys(keys)
+    invalidate_category_tree()
+    invalidate_facet_index()
+    bump_book_json_generation()
+    schedule_snapshot_rebuild()
 
 
 @receiver([post_save, post_delete], sender=Banner)
@@ -86,6 +131,30 @@ def invalidate_featured_category_caches(sender, instance, **kwargs):
         keys.append(home_featured_cfgs_key(lang))
     keys += _home_featured_books_keys_for_all_languages()
     _invalidate_keys(keys)
+    bump_home_sections([featured_section_key(instance.id)])
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_counter_pair(sender, instance, **kwargs):
+    """
+    Keep the pre-edit (category, author) so moving a book decrements the old counters too.
+    """
+    old = None
+    if instance.pk:
+        old = Book.objects.filter(pk=instance.pk).values_list("category_id", "author_id").first()
+    instance._counter_pair = old
+
+
+@receiver([post_save, post_delete], sender=Book)
+def update_book_counters(sender, instance, **kwargs):
+    """
+    Maintain Author/Category book_count and CategoryAuthorStat so pages never aggregate over Book.
+    """
+    pairs = {(instance.category_id, instance.author_id)}
+    old = getattr(instance, "_counter_pair", None)
+    if old:
+        pairs.add(old)
+    refresh_book_counters(pairs)
 
 
 @receiver([post_save, post_delete], sender=Book)
@@ -96,6 +165,7 @@ def invalidate_book_caches(sender, instance, **kwargs):
     """
     langs = language_codes()
     keys = []
+    sections = ["new", "best-selling", "recommended"]
     for lang in langs:
         keys += [
             home_best_selling_key(lang),
@@ -109,4 +179,37 @@ def invalidate_book_caches(sender, instance, **kwargs):
         for cfg in cfgs:
             limit = cfg.limit or 10
             keys.append(home_featured_books_key(cfg.category_id, limit, lang))
+            sections.append(featured_section_key(cfg.id))
     _invalidate_keys(keys)
+    bump_home_sections(set(sections))
+    bump_book_version(instance.id)
+    log_book_change(instance.id)
+    # Per-category book counts and sidebar authors live in the cached tree.
+    invalidate_category_tree()
+    invalidate_facet_index()
+    schedule_snapshot_rebuild()
+
+
+@receiver([post_save, post_delete], sender=AboutPage)
+def invalidate_about_caches(sender, instance, **kwargs):
+    """
+    About content is served by api_about; bump the catalog stamp so its ETag changes.
+    """
+    bump_catalog_state()
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Category)
+def record_catalog_tombstone(sender, instance, **kwargs):
+    """
+    Delta-sync clients only see rows that still exist; remember deletions so they can drop them too.
+    Deletes are rare admin actions, so expired tombstones are pruned here instead of by a cron job.
+    """
+    kind = {
+        Book: CatalogTombstone.KIND_BOOK,
+        Author: CatalogTombstone.KIND_AUTHOR,
+        Category: CatalogTombstone.KIND_CATEGORY,
+    }[sender]
+    record_tombstone(kind, instance.pk)
+    prune_tombstones()
@@ -0,0 +1,79 @@
+import logging
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from ..services.bundles import EXTENSIONS, bundle_path, prepare
+
+logger = logging.getLogger("django")
+register = template.Library()
+
+MODES = ("inline", "async")
+
+
+class BundleNode(template.Node):
+    def __init__(self, name, kind, mode, nodelist):
+        self.name = name
+        self.kind = kind
+        self.mode = mode
+        self.nodelist = nodelist
+        self._content = None
+        self._url = None
+
+    def content(self) -> str:
+        """Rendered once without request data; bundle blocks may only use {% url %}/{% static %}-style tags."""
+        if self._content is None:
+            self._content = prepare(self.kind, self.nodelist.render(template.Context(autoescape=False)))
+        return self._content
+
+    def path(self) -> str:
+        return bundle_path(self.name, self.kind, self.content())
+
+    def built_url(self):
+        if self._url is None:
+            path = self.path()
+            if staticfiles_storage.exists(path):
+                self._url = static(path)
+            else:
+                logger.warning("bundle %s not built (run build_bundles and collectstatic); inlining", path)
+                self._url = ""
+        return self._url
+
+    def render(self, context):
+        url = "" if self.mode == "inline" or settings.DEBUG else self.built_url()
+        if not url:
+            tag = "style" if self.kind == "css" else "script"
+            return mark_safe(f"<{tag}>{self.content()}</{tag}>")
+        if self.kind == "js":
+            return format_html('<script src="{}"></script>', url)
+        if self.mode == "async":
+            return format_html(
+                '<link rel="stylesheet" href="{}" media="print" onload="this.media=\'all\'">'
+                '<noscript><link rel="stylesheet" href="{}"></noscript>',
+                url,
+                url,
+            )
+        return format_html('<link rel="stylesheet" href="{}">', url)
+
+
+@register.tag
+def bundle(parser, token):
+    """
+    {% bundle "checkout" js %}...{% endbundle %}
+    {% bundle "critical" css inline %}...{% endbundle %}
+
+    Body is plain CSS or JS (no <style>/<script> wrapper). Built by build_bundles into a
+    cacheable static file; `inline` keeps it in the page (critical CSS, size-checked), `async`
+    loads a stylesheet without blocking render.
+    """
+    bits = token.split_contents()
+    if len(bits) not in (3, 4) or bits[2] not in EXTENSIONS or (len(bits) == 4 and bits[3] not in MODES):
+        raise template.TemplateSyntaxError(f"Usage: {{% {bits[0]} \"name\" css|js [inline|async] %}}")
+    name = bits[1].strip("\"'")
+    nodelist = parser.parse(("endbundle",))
+    parser.delete_first_token()
+    return BundleNode(name, bits[2], bits[3] if len(bits) == 4 else "", nodelist)
@@ -0,0 +1,21 @@
+from django import template
+
+from ..services.book_cards import CARD_TEMPLATES, render_book_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def book_cards(books, variant):
+    """
+    Cached HTML cards for a list of books, fetched with one cache round trip.
+
+    {% book_cards books "grid" as cards %}
+    {% for card in cards %}<div class="col-6 col-md-3">{{ card }}</div>{% empty %}...{% endfor %}
+
+    Cards must not depend on the request (user, CSRF token, query string); anything
+    per-user stays in the page template around them.
+    """
+    if variant not in CARD_TEMPLATES:
+        raise template.TemplateSyntaxError(f"book_cards: unknown variant '{variant}'")
+    return render_book_cards(books, variant)
@@ -0,0 +1,60 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..services.resize import resized_url
+from ..services.thumbnails import IMAGE_FIELDS, instance_placeholder, instance_thumbnails
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(obj, sizes="100vw", **attrs):
+    """
+    <picture> with WebP and JPEG srcsets for a Book cover, Author photo or Banner image.
+
+    {% responsive_image book sizes="(max-width: 767px) 50vw, 25vw" class="card-img-top" alt=book.title loading="lazy" %}
+
+    width/height come from the stored original size so the browser reserves the box before
+    the file arrives, and the stored colour/blurred preview paints that box in the meantime.
+    Images without thumbnails yet fall back to a plain <img> of the original.
+    """
+    field = getattr(obj, IMAGE_FIELDS[type(obj)].field)
+    if not field:
+        return ""
+    thumbs, width, height = instance_thumbnails(obj)
+    placeholder = instance_placeholder(obj)
+    if placeholder is not None:
+        # The decoded image paints over its own background, so nothing needs removing on load.
+        background = f"background:{placeholder.color}"
+        if placeholder.data_uri:
+            background += f" url({placeholder.data_uri}) center/cover no-repeat"
+        attrs["style"] = f"{background};{attrs['style']}" if attrs.get("style") else background
+    extra = format_html_join("", ' {}="{}"', ((name.replace("_", "-"), value) for name, value in attrs.items()))
+    if not thumbs:
+        return format_html('<img src="{}"{}>', field.url, extra)
+
+    storage = field.storage
+    jpeg = ", ".join(f"{storage.url(t.jpeg)} {t.width}w" for t in thumbs)
+    webp = ", ".join(f"{storage.url(t.webp)} {t.width}w" for t in thumbs)
+    fallback = thumbs[min(1, len(thumbs) - 1)]
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}"{}></picture>',
+        webp,
+        sizes,
+        storage.url(fallback.jpeg),
+        jpeg,
+        sizes,
+        width,
+        height,
+        extra,
+    )
+
+
+@register.filter
+def resized(field, size):
+    """{{ book.cover_image|resized:"320x440" }} -> URL of an on-demand variant (IMAGE_RESIZE_SIZES)."""
+    if not field:
+        return ""
+    width, height = (int(n) for n in size.lower().split("x"))
+    return resized_url(field.name, width, height)
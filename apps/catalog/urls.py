@@ -3,10 +3,12 @@ from . import views
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("bolim/<slug:key>/", views.home_section, name="home_section"),
     path("api/home/", views.api_home, name="api_home"),
     path("api/categories/", views.api_categories, name="api_categories"),
     path("api/authors/", views.api_authors, name="api_authors"),
     path("api/books/", views.api_books, name="api_books"),
+    path("api/books/changes/", views.api_book_changes, name="api_book_changes"),
     path("api/books/<int:id>/", views.api_book_detail, name="api_book_detail"),
     path("api/about/", views.api_about, name="api_about"),
     path("kategoriyalar/", views.categories_list, name="categories_list"),
@@ -17,9 +19,14 @@ urlpatterns = [
     path("eng-kop-sotilgan/", views.best_selling_list, name="best_selling_list"),
     path("tavsiya-etilgan/", views.recommended_list, name="recommended_list"),
     path("kategoriya/<slug:slug>/", views.category_detail, name="category_detail"),
+    path("kategoriya/<slug:slug>/kitoblar/", views.category_books_fragment, name="category_books_fragment"),
     path("kitob/<int:id>/<slug:slug>/", views.book_detail, name="book_detail"),
     path("qidiruv/", views.search, name="search"),
+    path("qidiruv/kitoblar/", views.search_books_fragment, name="search_books_fragment"),
     path("sevimlilar/", views.favorites, name="favorites"),
     path("sevimlilar/qoshish/<int:book_id>/", views.add_favorite, name="add_favorite"),
     path("sevimlilar/ochirish/<int:book_id>/", views.remove_favorite, name="remove_favorite"),
+    path("media/resized/<int:width>x<int:height>/<path:name>", views.resized_image, name="resized_image"),
+    # media.conf rewrites misses under /media/resized/ here, past the Apache alias.
+    path("_resize/<int:width>x<int:height>/<path:name>", views.resized_image),
 ]
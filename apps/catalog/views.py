@@ -1,33 +1,52 @@
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.db.models import Q, F
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
 from django.utils.http import url_has_allowed_host_and_scheme
-from django.core.cache import cache
-from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_GET
 from django.conf import settings
 from django.utils.translation import get_language
-from .models import Category, Book, Author, Banner, FeaturedCategory
-
-
-from .cache_keys import (
-    home_top_categories_key,
-    home_featured_authors_key,
-    home_banners_key,
-    home_featured_cfgs_key,
-    home_featured_books_key,
-    home_best_selling_key,
-    home_new_books_key,
-    home_recommended_key,
-    best_selling_list_key,
-    recommended_list_key,
-    categories_top_key,
+from PIL import Image
+
+from config.middleware import compressed_cache_page
+from .models import Category, Book, Author
+from .services.cached_queries import (
+    HOME_TTL,
+    LIST_TTL,
+    CATEGORY_TTL,
+    get_home_banners,
+    get_home_featured_authors,
+    get_home_top_categories,
+    get_top_categories,
+    get_best_selling_list,
+    get_recommended_list,
 )
-
-HOME_TTL = 60 * 5  # 5 minutes; homepage rotates moderately often
-LIST_TTL = 60 * 10  # 10 minutes; bestseller/recommended lists are stable
-CATEGORY_TTL = 60 * 15  # 15 minutes; taxonomy changes rarely
+from .serializers import (
+    parse_book_fields,
+    project_book_queryset,
+    serialize_author,
+    serialize_book,
+    serialize_category,
+)
+from .services.api_payloads import about_payload, categories_payload, home_payload
+from .services.book_json import SplicedJsonResponse, book_fragments, book_fragments_for_ids
+from .services.catalog_index import cursor_page, get_catalog_index
+from .services.category_tree import get_category_tree
+from .services.conditional import conditional_catalog_get
+from .services.facets import facet_authors, facets_json, get_facet_index, parse_facet_filters
+from .services.home_sections import (
+    INLINE_SECTIONS,
+    SECTION_TEMPLATE,
+    get_home_section,
+    home_sections,
+    section_books,
+    section_versions,
+)
+from .services.resize import ResizeBusy, allowed_sizes, resize, source_path, target_path
+from .services.streaming import GRID_TEMPLATE, STREAM_CHUNK, books_in_order, stream_listing
+from .services.sync import InvalidSyncToken, collect_changes
 
 
 _LATIN_TO_CYR = {
@@ -131,71 +150,17 @@ def _build_search_variants(query: str) -> list:
     return [v for v in variants if v]
 
 
-def _abs_media_url(request, field):
-    if not field:
-        return None
-    try:
-        url = field.url
-    except Exception:
-        return None
-    return request.build_absolute_uri(url)
-
-
-def _serialize_category(category):
-    return {
-        "id": category.id,
-        "name": category.name,
-        "slug": category.slug,
-        "parent_id": category.parent_id,
-    }
-
-
-def _serialize_author(request, author):
-    return {
-        "id": author.id,
-        "name": author.name,
-        "bio": author.bio,
-        "is_featured": author.is_featured,
-        "photo": _abs_media_url(request, author.photo),
-    }
-
-
-def _serialize_banner(request, banner):
-    return {
-        "id": banner.id,
-        "title": banner.title,
-        "image": _abs_media_url(request, banner.image),
-        "link": banner.link,
-        "order": banner.order,
-        "is_active": banner.is_active,
-    }
+def _search_filter(query: str) -> Q:
+    # Book.search_text is lower-cased title + author + category, so a plain
+    # contains on one column replaces three icontains across joined tables.
+    q_filter = Q()
+    for term in _build_search_variants(query):
+        q_filter |= Q(search_text__contains=term.lower())
+    return q_filter
 
 
-def _serialize_book(request, book):
-    return {
-        "id": book.id,
-        "title": book.title,
-        "slug": book.slug,
-        "description": book.description,
-        "purchase_price": str(book.purchase_price),
-        "sale_price": str(book.sale_price),
-        "stock_quantity": book.stock_quantity,
-        "book_format": book.book_format,
-        "pages": book.pages,
-        "is_recommended": book.is_recommended,
-        "views": book.views,
-        "created_at": book.created_at.isoformat(),
-        "cover_image": _abs_media_url(request, book.cover_image),
-        "author": {
-            "id": book.author_id,
-            "name": book.author.name,
-        },
-        "category": {
-            "id": book.category_id,
-            "name": book.category.name,
-            "slug": book.category.slug,
-        },
-    }
+# Cards per category/search page and per infinite-scroll fragment (6 rows of 4).
+LISTING_PAGE_SIZE = 24
 
 
 def _get_pagination(request, default_limit=20, max_limit=100):
@@ -216,115 +181,92 @@ def _get_pagination(request, default_limit=20, max_limit=100):
     return limit, offset
 
 
-@cache_page(HOME_TTL)
+def _requested_book_fields(request):
+    """Return (fields, error_response) for the optional ?fields= sparse fieldset."""
+    fields, invalid = parse_book_fields(request.GET.get("fields", ""))
+    if invalid:
+        return None, JsonResponse({"error": "invalid_fields", "invalid": invalid}, status=400)
+    return fields, None
+
+
+# Extra facet selects shown next to the author filter on HTML listings.
+_FACET_SELECTS = (
+    ("format", "Format"),
+    ("price", "Narx"),
+    ("pages", "Betlar soni"),
+    ("in_stock", "Mavjudligi"),
+)
+
+
+def _facet_groups(result, params):
+    return [
+        {"name": name, "title": title, "current": params.get(name) or "", "values": result.facets[name]}
+        for name, title in _FACET_SELECTS
+    ]
+
+
+def _parse_ids(raw, max_ids=100):
+    ids = []
+    for part in raw.split(","):
+        part = part.strip()
+        if not part.isdecimal():
+            return None
+        ids.append(int(part))
+    if not ids or len(ids) > max_ids:
+        return None
+    return list(dict.fromkeys(ids))
+
+
+@compressed_cache_page(HOME_TTL)
 def home(request):
     lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
     # Cache only public, non-user-specific content to reduce DB hits.
-    categories = cache.get_or_set(
-        home_top_categories_key(lang),
-        lambda: list(Category.objects.filter(parent__isnull=True)[:4]),
-        HOME_TTL,
-    )
-    authors = cache.get_or_set(
-        home_featured_authors_key(lang),
-        lambda: list(Author.objects.filter(is_featured=True)[:10]),
-        HOME_TTL,
-    )
-    banners = cache.get_or_set(
-        home_banners_key(lang),
-        lambda: list(
-            Banner.objects.filter(is_active=True)
-            .order_by("order", "-created_at")
-            .select_related(None)[:5]
-        ),
-        HOME_TTL,
-    )
-    featured_cfgs = cache.get_or_set(
-        home_featured_cfgs_key(lang),
-        lambda: list(
-            FeaturedCategory.objects.filter(is_active=True)
-            .select_related("category")
-        ),
-        HOME_TTL,
-    )
-    featured_sections = []
-    for cfg in featured_cfgs:
-        limit = cfg.limit or 10
-        books_key = home_featured_books_key(cfg.category_id, limit, lang)
-        books = cache.get_or_set(
-            books_key,
-            lambda: list(
-                Book.objects.filter(category=cfg.category)
-                .select_related("author", "category")
-                .order_by("-created_at")[:limit]
-            ),
-            HOME_TTL,
-        )
-        featured_sections.append(
-            {
-                "title": cfg.title or cfg.category.name,
-                "category": cfg.category,
-                "books": books,
-            }
-        )
-    best_selling = cache.get_or_set(
-        home_best_selling_key(lang),
-        lambda: list(
-            Book.objects.select_related("author", "category")
-            .order_by("-views")[:6]
-        ),
-        LIST_TTL,
-    )
-    new_books = cache.get_or_set(
-        home_new_books_key(lang),
-        lambda: list(
-            Book.objects.select_related("author", "category")
-            .order_by("-created_at")[:6]
-        ),
-        HOME_TTL,
-    )
-    recommended = cache.get_or_set(
-        home_recommended_key(lang),
-        lambda: list(
-            Book.objects.filter(is_recommended=True)
-            .select_related("author", "category")
-            .order_by("-created_at")[:6]
-        ),
-        LIST_TTL,
-    )
-    return render(
-        request,
-        "home.html",
-        {
-            "categories": categories,
-            "authors": authors,
-            "banners": banners,
-            "featured_sections": featured_sections,
-            "best_selling": best_selling,
-            "new_books": new_books,
-            "recommended": recommended,
-        },
-    )
+    # Only the first book strips render here; the rest are deferred to home_section fragments.
+    sections = home_sections(lang)
+    inline, deferred = sections[:INLINE_SECTIONS], sections[INLINE_SECTIONS:]
+    versions = section_versions([section.key for section in deferred])
+    context = {
+        "categories": get_home_top_categories(lang),
+        "authors": get_home_featured_authors(lang),
+        "banners": get_home_banners(lang),
+        "inline_sections": [{"section": section, "books": section_books(section.key, lang)} for section in inline],
+        "deferred_sections": [
+            {"section": section, "url": f"{reverse('home_section', args=[section.key])}?v={versions[section.key]}"}
+            for section in deferred
+        ],
+    }
+    return render(request, "home.html", context)
 
 
-@cache_page(CATEGORY_TTL)
+# No fixed timeout: the page cache takes each strip's own TTL from the max-age set below.
+@compressed_cache_page(None)
+@require_GET
+def home_section(request, key):
+    """One deferred home strip; ?v= changes whenever the strip does, so the URL is safe to cache."""
+    lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
+    section = get_home_section(key, lang)
+    if section is None:
+        raise Http404("Bo‘lim topilmadi")
+    html = render_to_string(SECTION_TEMPLATE, {"section": section, "books": section_books(key, lang)})
+    response = HttpResponse(html)
+    patch_cache_control(response, public=True, max_age=section.ttl)
+    return response
+
+
+@compressed_cache_page(CATEGORY_TTL)
 def categories_list(request):
     lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
-    categories = cache.get_or_set(
-        categories_top_key(lang),
-        lambda: list(Category.objects.filter(parent__isnull=True).order_by("name")),
-        CATEGORY_TTL,
-    )
+    categories = get_top_categories(lang)
     return render(request, "categories_list.html", {"categories": categories})
 
 
-@cache_page(CATEGORY_TTL)
+@compressed_cache_page(CATEGORY_TTL)
 def authors_list(request):
     authors = Author.objects.all().order_by("name")
     return render(request, "authors_list.html", {"authors": authors})
 
 
-@cache_page(CATEGORY_TTL)
+@compressed_cache_page(CATEGORY_TTL)
 def about(request):
     from .models import AboutPage
 
@@ -336,100 +278,114 @@ def about(request):
     return render(request, "about.html", {"about_page": about_page})
 
 
-@cache_page(HOME_TTL)
+@compressed_cache_page(HOME_TTL)
 def new_books_list(request):
-    books = Book.objects.select_related("author", "category").order_by("-created_at")
-    return render(request, "book_list.html", {"title": "Yangi qo‘shilganlar", "books": books})
+    books = books_in_order(get_catalog_index().sorted_ids("newest"))
+    return stream_listing(request, "book_list.html", {"title": "Yangi qo‘shilganlar"}, books)
 
 
-@cache_page(LIST_TTL)
+@compressed_cache_page(LIST_TTL)
 def best_selling_list(request):
     lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
-    # Safe to cache: same for every user, changes only when sales/views change.
-    books = cache.get_or_set(
-        best_selling_list_key(lang),
-        lambda: list(Book.objects.select_related("author", "category").order_by("-views")),
-        LIST_TTL,
-    )
+    books = get_best_selling_list(lang)
     return render(request, "book_list.html", {"title": "Eng ko‘p sotilganlar", "books": books})
 
 
-@cache_page(LIST_TTL)
+@compressed_cache_page(LIST_TTL)
 def recommended_list(request):
     lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
-    # Safe to cache: recommendation flag is content-based, not user-based.
-    books = cache.get_or_set(
-        recommended_list_key(lang),
-        lambda: list(
-            Book.objects.filter(is_recommended=True)
-            .select_related("author", "category")
-            .order_by("-created_at")
-        ),
-        LIST_TTL,
-    )
+    books = get_recommended_list(lang)
     return render(request, "book_list.html", {"title": "Tavsiya etilganlar", "books": books})
 
 
-@cache_page(CATEGORY_TTL)
+@compressed_cache_page(CATEGORY_TTL)
 def author_detail(request, author_id):
     author = get_object_or_404(Author, id=author_id)
     books = (
         Book.objects.filter(author=author)
-        .select_related("author", "category")
         .order_by("-created_at")
     )
-    return render(request, "book_list.html", {"title": author.name, "books": books})
-
-
-@cache_page(CATEGORY_TTL)
+    return stream_listing(request, "book_list.html", {"title": author.name}, books.iterator(chunk_size=STREAM_CHUNK))
+
+
+def _category_listing(request, slug):
+    """Category, facet result and ordered book ids shared by the page and its scroll fragments."""
+    tree = get_category_tree()
+    category = tree.get_by_slug(slug)
+    if category is None:
+        raise Http404("Kategoriya topilmadi")
+    # Whole subtree (children, grandchildren, ...) from the cached tree, no recursive queries.
+    # Filters and sidebar counts come from the facet bitmaps; the category bitmap covers the subtree.
+    index = get_facet_index()
+    filters = parse_facet_filters(request.GET, facets=("author", "format", "price", "pages", "in_stock"))
+    filters["category"] = (str(category.id),)
+    result = index.search(filters)
+
+    # Ordering comes from the catalog index's pre-sorted permutations; the DB only hydrates rows.
+    sort = request.GET.get("sort")
+    if sort not in ("price_asc", "price_desc", "newest", "oldest", "popular"):
+        sort = None
+    ordered = get_catalog_index().sorted_ids(sort, among=index.ids_for(result.mask))
+    return tree, category, filters, result, sort, ordered
+
+
+def _next_page(request, fragment_url, cursor):
+    """Scroll fragment URL and plain page link (no-JS fallback) for the next cursor, same filters."""
+    if cursor is None:
+        return {}
+    params = request.GET.copy()
+    params["cursor"] = cursor
+    query = params.urlencode()
+    return {"next_page": f"{fragment_url}?{query}", "next_page_link": f"{request.path}?{query}"}
+
+
+def _grid_fragment(request, ordered, size=None):
+    """Next slice of book-card HTML; X-Next-Page carries the fragment URL after it."""
+    ids, cursor = cursor_page(ordered, request.GET.get("cursor"), size or LISTING_PAGE_SIZE)
+    response = HttpResponse(render_to_string(GRID_TEMPLATE, {"books": list(books_in_order(ids))}))
+    next_page = _next_page(request, request.path, cursor)
+    if next_page:
+        response["X-Next-Page"] = next_page["next_page"]
+    return response
+
+
+@compressed_cache_page(CATEGORY_TTL)
 def category_detail(request, slug):
-    category = get_object_or_404(Category, slug=slug)
-    descendants = category.children.all()
-    category_ids = [category.id] + list(descendants.values_list("id", flat=True))
-    books = (
-        Book.objects.filter(category__in=category_ids)
-        .select_related("author", "category")
-    )
-    authors = Author.objects.filter(books__category__in=category_ids).distinct()
-
-    author_id = request.GET.get("author")
-    if author_id:
-        books = books.filter(author_id=author_id)
-
-    sort = request.GET.get("sort")
-    sort_map = {
-        "price_asc": "sale_price",
-        "price_desc": "-sale_price",
-        "newest": "-created_at",
-        "oldest": "created_at",
-        "popular": "-views",
-    }
-    if sort in sort_map:
-        books = books.order_by(sort_map[sort])
+    tree, category, filters, result, sort, ordered = _category_listing(request, slug)
+    ids, cursor = cursor_page(ordered, request.GET.get("cursor"), LISTING_PAGE_SIZE)
 
     return render(
         request,
         "category_list.html",
         {
             "category": category,
-            "books": books,
-            "authors": authors,
-            "current_author": author_id,
+            "books": list(books_in_order(ids)),
+            "authors": facet_authors(result),
+            "current_author": request.GET.get("author"),
             "current_sort": sort,
-            "child_categories": descendants,
+            "facet_groups": _facet_groups(result, request.GET),
+            "has_facet_filters": any(name in filters for name, _ in _FACET_SELECTS),
+            "child_categories": category.children,
+            "breadcrumbs": tree.breadcrumbs(category.id),
+            **_next_page(request, reverse("category_books_fragment", args=[slug]), cursor),
         },
     )
 
 
+@compressed_cache_page(CATEGORY_TTL)
+@require_GET
+def category_books_fragment(request, slug):
+    return _grid_fragment(request, _category_listing(request, slug)[-1])
+
+
 def book_detail(request, id, slug):
-    book = get_object_or_404(Book.objects.select_related("author", "category"), id=id, slug=slug)
+    book = get_object_or_404(Book, id=id, slug=slug)
     Book.objects.filter(id=book.id).update(views=F("views") + 1)
     favorites = request.session.get("favorites", [])
     in_favorites = str(book.id) in favorites
     similar_books = (
-        Book.objects.filter(category=book.category)
+        Book.objects.filter(category_id=book.category_id)
         .exclude(id=book.id)
-        .select_related("author", "category")
         .order_by("-views")[:10]
     )
     return render(
@@ -443,22 +399,44 @@ def book_detail(request, id, slug):
     )
 
 
-@cache_page(LIST_TTL)
+def _search_listing(request):
+    """Facet result (None without a query) and ordered book ids shared by search and its scroll fragments."""
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return query, None, []
+    # Text match runs once in the DB; author/category/format/price/... filters and the
+    # sidebar counts are bitmap operations on the facet index, sorting is the catalog index's.
+    index = get_facet_index()
+    matched = index.mask_for_ids(Book.objects.filter(_search_filter(query)).values_list("id", flat=True))
+    result = index.search(parse_facet_filters(request.GET), base=matched)
+    ordered = get_catalog_index().sorted_ids(request.GET.get("sort"), among=index.ids_for(result.mask))
+    return query, result, ordered
+
+
+def _search_page_size(request):
+    # ?limit= is the page size picked in the sort/limit sheet; scrolling loads further pages.
+    try:
+        limit = int(request.GET.get("limit") or LISTING_PAGE_SIZE)
+    except ValueError:
+        limit = LISTING_PAGE_SIZE
+    return min(limit, 100) if limit > 0 else LISTING_PAGE_SIZE
+
+
+@compressed_cache_page(LIST_TTL)
 def search(request):
     def normalize(v):
         return None if v in [None, "", "None", "null"] else v
 
-    query = request.GET.get("q", "").strip()
-    variants = _build_search_variants(query) if query else []
-
     # Normalize GET params
     author_id = normalize(request.GET.get("author"))
     category_slug = normalize(request.GET.get("category"))
     sort = normalize(request.GET.get("sort"))
     limit = normalize(request.GET.get("limit"))
 
-    books = Book.objects.none()
-    authors = Author.objects.none()
+    query, result, ordered = _search_listing(request)
+    ids, cursor = cursor_page(ordered, request.GET.get("cursor"), _search_page_size(request))
+    authors = facet_authors(result) if result is not None else []
+    facet_groups = _facet_groups(result, request.GET) if result is not None else []
     categories = Category.objects.all()
 
     sort_options = [
@@ -472,59 +450,13 @@ def search(request):
     ]
 
     limit_options = ["8", "12", "16", "24", "32"]
-    top_searched = (
-        Book.objects.select_related("author", "category")
-        .order_by("-views")[:5]
-    )
+    top_searched = Book.objects.order_by("-views")[:5]
 
-    if query:
-        q_filter = Q()
-        for term in variants:
-            q_filter |= Q(title__icontains=term)
-            q_filter |= Q(author__name__icontains=term)
-            q_filter |= Q(category__name__icontains=term)
-        books = Book.objects.filter(q_filter).select_related("author", "category")
-
-        # Filter by author
-        if author_id:
-            books = books.filter(author_id=author_id)
-
-        # Filter by category
-        if category_slug:
-            books = books.filter(category__slug=category_slug)
-
-        # Sorting
-        sort_map = {
-            "price_asc": "sale_price",
-            "price_desc": "-sale_price",
-            "newest": "-created_at",
-            "oldest": "created_at",
-            "popular": "-views",
-            "alpha_asc": "title",
-            "alpha_desc": "-title",
-        }
-
-        if sort in sort_map:
-            books = books.order_by(sort_map[sort])
-
-        # Sidebar authors
-        authors = Author.objects.filter(books__in=books).distinct()
-
-        # Limit
-        if limit:
-            try:
-                limit_int = int(limit)
-                if limit_int > 0:
-                    books = books[:limit_int]
-            except ValueError:
-                pass
-
-    return render(
+    return stream_listing(
         request,
         "search_results.html",
         {
             "query": query,
-            "books": books,
             "authors": authors,
             "categories": categories,
             "top_searched": top_searched,
@@ -532,16 +464,24 @@ def search(request):
             "current_category": category_slug,
             "current_sort": sort,
             "current_limit": limit,
+            "facet_groups": facet_groups,
             "sort_options": sort_options,
             "limit_options": limit_options,
+            **_next_page(request, reverse("search_books_fragment"), cursor),
         },
+        books_in_order(ids),
     )
 
 
+@compressed_cache_page(LIST_TTL)
+@require_GET
+def search_books_fragment(request):
+    return _grid_fragment(request, _search_listing(request)[-1], _search_page_size(request))
+
 
 def favorites(request):
     fav_ids = request.session.get("favorites", [])
-    books = Book.objects.filter(id__in=fav_ids).select_related("author", "category")
+    books = Book.objects.filter(id__in=fav_ids)
     return render(request, "favorites.html", {"books": books})
 
 
@@ -571,203 +511,147 @@ def remove_favorite(request, book_id):
     return redirect("favorites")
 
 
-@cache_page(HOME_TTL)
+@conditional_catalog_get(HOME_TTL)
+@compressed_cache_page(HOME_TTL)
 @require_GET
 def api_home(request):
-    lang = get_language() or getattr(settings, "LANGUAGE_CODE", "default")
-    categories = cache.get_or_set(
-        home_top_categories_key(lang),
-        lambda: list(Category.objects.filter(parent__isnull=True)[:4]),
-        HOME_TTL,
-    )
-    authors = cache.get_or_set(
-        home_featured_authors_key(lang),
-        lambda: list(Author.objects.filter(is_featured=True)[:10]),
-        HOME_TTL,
-    )
-    banners = cache.get_or_set(
-        home_banners_key(lang),
-        lambda: list(
-            Banner.objects.filter(is_active=True)
-            .order_by("order", "-created_at")
-            .select_related(None)[:5]
-        ),
-        HOME_TTL,
-    )
-    featured_cfgs = cache.get_or_set(
-        home_featured_cfgs_key(lang),
-        lambda: list(
-            FeaturedCategory.objects.filter(is_active=True)
-            .select_related("category")
-        ),
-        HOME_TTL,
-    )
-    featured_sections = []
-    for cfg in featured_cfgs:
-        limit = cfg.limit or 10
-        books_key = home_featured_books_key(cfg.category_id, limit, lang)
-        books = cache.get_or_set(
-            books_key,
-            lambda: list(
-                Book.objects.filter(category=cfg.category)
-                .select_related("author", "category")
-                .order_by("-created_at")[:limit]
-            ),
-            HOME_TTL,
-        )
-        featured_sections.append(
-            {
-                "title": cfg.title or cfg.category.name,
-                "category": _serialize_category(cfg.category),
-                "books": [_serialize_book(request, book) for book in books],
-            }
-        )
-    best_selling = cache.get_or_set(
-        home_best_selling_key(lang),
-        lambda: list(
-            Book.objects.select_related("author", "category")
-            .order_by("-views")[:6]
-        ),
-        LIST_TTL,
-    )
-    new_books = cache.get_or_set(
-        home_new_books_key(lang),
-        lambda: list(
-            Book.objects.select_related("author", "category")
-            .order_by("-created_at")[:6]
-        ),
-        HOME_TTL,
-    )
-    recommended = cache.get_or_set(
-        home_recommended_key(lang),
-        lambda: list(
-            Book.objects.filter(is_recommended=True)
-            .select_related("author", "category")
-            .order_by("-created_at")[:6]
-        ),
-        LIST_TTL,
-    )
-    data = {
-        "categories": [_serialize_category(category) for category in categories],
-        "authors": [_serialize_author(request, author) for author in authors],
-        "banners": [_serialize_banner(request, banner) for banner in banners],
-        "featured_sections": featured_sections,
-        "best_selling": [_serialize_book(request, book) for book in best_selling],
-        "new_books": [_serialize_book(request, book) for book in new_books],
-        "recommended": [_serialize_book(request, book) for book in recommended],
-    }
-    return JsonResponse(data)
+    fields, error = _requested_book_fields(request)
+    if error:
+        return error
+    return SplicedJsonResponse(home_payload(request, fields))
 
 
-@cache_page(CATEGORY_TTL)
+@conditional_catalog_get(CATEGORY_TTL)
+@compressed_cache_page(CATEGORY_TTL)
 @require_GET
 def api_categories(request):
-    categories = list(Category.objects.all().order_by("name"))
-    by_id = {
-        category.id: {**_serialize_category(category), "children": []}
-        for category in categories
-    }
-    roots = []
-    for category in categories:
-        payload = by_id[category.id]
-        if category.parent_id and category.parent_id in by_id:
-            by_id[category.parent_id]["children"].append(payload)
-        else:
-            roots.append(payload)
-    return JsonResponse({"items": roots})
+    return JsonResponse(categories_payload(request))
 
 
-@cache_page(CATEGORY_TTL)
+@conditional_catalog_get(CATEGORY_TTL)
+@compressed_cache_page(CATEGORY_TTL)
 @require_GET
 def api_authors(request):
     authors = Author.objects.all().order_by("name")
-    return JsonResponse({"items": [_serialize_author(request, author) for author in authors]})
+    return JsonResponse({"items": [serialize_author(request, author) for author in authors]})
 
 
-@cache_page(LIST_TTL)
+@compressed_cache_page(LIST_TTL)
 @require_GET
 def api_books(request):
-    qs = Book.objects.select_related("author", "category").all()
+    fields, error = _requested_book_fields(request)
+    if error:
+        return error
+    qs = project_book_queryset(Book.objects.all(), fields)
+
+    raw_ids = request.GET.get("ids")
+    if raw_ids is not None:
+        # Batch lookup for cart/favorites screens: one in_bulk query, response in request order.
+        ids = _parse_ids(raw_ids)
+        if ids is None:
+            return JsonResponse({"error": "invalid_ids"}, status=400)
+        found = qs.in_bulk(ids)
+        data = {
+            "items": book_fragments(request, [found[i] for i in ids if i in found], serialize_book, fields),
+            "missing": [i for i in ids if i not in found],
+        }
+        return SplicedJsonResponse(data)
+
+    # ?category=, ?author=, ?format=, ?price=, ?pages=, ?in_stock= (comma-separated values)
+    # are resolved on the facet bitmaps; only ?q= touches the DB before the page query.
+    index = get_facet_index()
+    base = None
     query = request.GET.get("q", "").strip()
     if query:
-        variants = _build_search_variants(query)
-        q_filter = Q()
-        for term in variants:
-            q_filter |= Q(title__icontains=term)
-            q_filter |= Q(author__name__icontains=term)
-            q_filter |= Q(category__name__icontains=term)
-        qs = qs.filter(q_filter)
-
-    category = request.GET.get("category")
-    if category:
-        if category.isdigit():
-            qs = qs.filter(category_id=int(category))
-        else:
-            qs = qs.filter(category__slug=category)
-
-    author = request.GET.get("author")
-    if author and author.isdigit():
-        qs = qs.filter(author_id=int(author))
-
-    sort = request.GET.get("sort")
-    sort_map = {
-        "price_asc": "sale_price",
-        "price_desc": "-sale_price",
-        "newest": "-created_at",
-        "oldest": "created_at",
-        "popular": "-views",
-        "alpha_asc": "title",
-        "alpha_desc": "-title",
-    }
-    if sort in sort_map:
-        qs = qs.order_by(sort_map[sort])
+        base = index.mask_for_ids(Book.objects.filter(_search_filter(query)).values_list("id", flat=True))
+    result = index.search(parse_facet_filters(request.GET), base=base)
 
-    total = qs.count()
+    # Sorting and paging run on the in-process catalog index; fragments are loaded by id
+    # and only cache misses touch the DB.
+    among = None if result.mask == index.all else index.ids_for(result.mask)
+    ordered = get_catalog_index().sorted_ids(request.GET.get("sort"), among=among)
     limit, offset = _get_pagination(request, default_limit=20, max_limit=100)
-    items = qs[offset : offset + limit]
+    items = book_fragments_for_ids(
+        request,
+        ordered[offset : offset + limit],
+        lambda ids: qs.in_bulk(ids),
+        serialize_book,
+        fields,
+    )
     data = {
-        "count": total,
+        "count": len(ordered),
         "limit": limit,
         "offset": offset,
-        "items": [_serialize_book(request, book) for book in items],
+        "items": items,
     }
-    return JsonResponse(data)
+    if request.GET.get("facets") in ("1", "true"):
+        data["facets"] = facets_json(result)
+    return SplicedJsonResponse(data)
+
+
+@require_GET
+def api_book_changes(request):
+    """Delta sync for app replicas: rows changed or deleted since the token from the previous call."""
+    try:
+        changes = collect_changes(request.GET.get("since") or None)
+    except InvalidSyncToken:
+        return JsonResponse({"error": "invalid_token"}, status=400)
+    data = {
+        "token": changes["token"],
+        "reset": changes["reset"],
+        "has_more": changes["has_more"],
+        "books": book_fragments(request, changes["books"], serialize_book),
+        "authors": [serialize_author(request, author) for author in changes["authors"]],
+        "categories": [serialize_category(category) for category in changes["categories"]],
+        "deleted": changes["deleted"],
+    }
+    return SplicedJsonResponse(data)
 
 
 @require_GET
 def api_book_detail(request, id):
-    book = get_object_or_404(Book.objects.select_related("author", "category"), id=id)
+    fields, error = _requested_book_fields(request)
+    if error:
+        return error
+    book = get_object_or_404(project_book_queryset(Book.objects.all(), fields, extra=("category",)), id=id)
     Book.objects.filter(id=book.id).update(views=F("views") + 1)
-    similar_books = (
-        Book.objects.filter(category=book.category)
-        .exclude(id=book.id)
-        .select_related("author", "category")
-        .order_by("-views")[:10]
-    )
+    similar_books = project_book_queryset(
+        Book.objects.filter(category_id=book.category_id).exclude(id=book.id),
+        fields,
+    ).order_by("-views")[:10]
     data = {
-        "book": _serialize_book(request, book),
-        "similar": [_serialize_book(request, item) for item in similar_books],
+        "book": book_fragments(request, [book], serialize_book, fields)[0],
+        "similar": book_fragments(request, similar_books, serialize_book, fields),
     }
-    return JsonResponse(data)
+    return SplicedJsonResponse(data)
 
 
-@cache_page(CATEGORY_TTL)
+@conditional_catalog_get(CATEGORY_TTL)
+@compressed_cache_page(CATEGORY_TTL)
 @require_GET
 def api_about(request):
-    from .models import AboutPage
+    return JsonResponse(about_payload(request))
 
-    about_page = (
-        AboutPage.objects.filter(is_active=True)
-        .order_by("-updated_at", "-id")
-        .first()
-    )
-    data = None
-    if about_page:
-        data = {
-            "title": about_page.title,
-            "body": about_page.body,
-            "link": about_page.link,
-            "image": _abs_media_url(request, about_page.image),
-            "updated_at": about_page.updated_at.isoformat(),
-        }
-    return JsonResponse({"item": data})
+
+@require_GET
+def resized_image(request, width, height, name):
+    """
+    /media/resized/<w>x<h>/<path>: render the variant once; media.conf serves the file from then on.
+    """
+    if (width, height) not in allowed_sizes():
+        raise Http404("Unsupported size")
+    source = source_path(name)
+    if source is None:
+        raise Http404("Image not found")
+    try:
+        path = resize(source, target_path(name, width, height), width, height)
+    except ResizeBusy:
+        response = HttpResponse("Busy, retry shortly", status=503, content_type="text/plain")
+        response["Retry-After"] = "2"
+        return response
+    except (OSError, ValueError, Image.DecompressionBombError):
+        raise Http404("Image could not be resized")
+    response = FileResponse(open(path, "rb"))
+    # Uploads never overwrite a name, so a variant URL always maps to the same bytes.
+    patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    return response
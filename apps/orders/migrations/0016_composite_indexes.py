@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-19 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0015_order_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["phone", "-created_at"], name="order_phone_created"),
+        ),
+    ]
@@ -52,6 +52,10 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Profile page: Order.objects.filter(phone=...).order_by("-created_at")
+            models.Index(fields=["phone", "-created_at"], name="order_phone_created"),
+        ]
 
     def __str__(self):
         return f"Buyurtma #{self.id} - {self.full_name}"
@@ -11,6 +11,7 @@ urlpatterns = [
     path("api/orders/", views.api_create_order, name="api_create_order"),
     path("api/delivery-quote/", views.delivery_quote, name="delivery_quote"),
     path("api/cart/", views.api_cart, name="api_cart"),
+    path("api/bootstrap/", views.api_bootstrap, name="api_bootstrap"),
     path("api/cart/add/", views.api_cart_add, name="api_cart_add"),
     path("api/cart/update/", views.api_cart_update, name="api_cart_update"),
     path("api/cart/remove/", views.api_cart_remove, name="api_cart_remove"),
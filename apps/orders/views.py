@@ -7,12 +7,15 @@ from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse
-from django.views.decorators.http import require_POST
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET, require_POST
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.utils.dateparse import parse_time
 from django.db import transaction
 
 from apps.catalog.models import Book
+from apps.catalog.services.api_payloads import PUBLIC_SECTIONS, cached_section
+from apps.catalog.services.book_json import SplicedJsonResponse
 from .cart import Cart
 from .forms import CheckoutForm
 from .models import DeliveryNotice, DeliverySettings, Order, OrderItem
@@ -183,6 +186,37 @@ def api_cart(request):
     return JsonResponse(_cart_json_payload(request, cart))
 
 
+def _parse_known_etags(raw):
+    known = {}
+    for part in (raw or "").split(","):
+        name, _, etag = part.partition(":")
+        if name.strip() and etag.strip():
+            known[name.strip()] = etag.strip()
+    return known
+
+
+@ensure_csrf_cookie
+@require_GET
+def api_bootstrap(request):
+    """
+    App start-up in one round trip: home, categories and about (shared cached forms) plus this user's cart.
+    Send ?known=home:<etag>,categories:<etag>,about:<etag> to have unchanged public sections omitted.
+    """
+    known = _parse_known_etags(request.GET.get("known"))
+    sections = {}
+    for name in PUBLIC_SECTIONS:
+        etag, body = cached_section(request, name)
+        if known.get(name) == etag:
+            sections[name] = {"etag": etag, "not_modified": True}
+        else:
+            sections[name] = {"etag": etag, "data": body}
+    # The cart is per session, so it is always computed fresh and never shared.
+    sections["cart"] = {"data": _cart_json_payload(request, Cart(request))}
+    response = SplicedJsonResponse({"sections": sections})
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 @require_POST
 def api_cart_add(request):
     payload = _read_json(request)
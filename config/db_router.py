@@ -0,0 +1,169 @@
+"""
+Primary/replica routing for catalog reads.
+
+Only catalog models are read from DATABASES["replica"]; everything else and every write uses
+"default". ReplicaPinningMiddleware pins whole requests to the primary (writes, checkout,
+admin, a client's own recent writes, and a short window after any catalog edit so shared
+caches are never rebuilt from a lagging replica). A replica that is unreachable or too far
+behind is skipped for DATABASE_REPLICA_RETRY seconds.
+"""
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, InterfaceError, OperationalError, connections
+
+logger = logging.getLogger("django")
+
+PRIMARY = "default"
+REPLICA = "replica"
+REPLICA_APPS = {"catalog"}
+
+_pinned = contextvars.ContextVar("db_pinned_to_primary", default=False)
+_wrote = contextvars.ContextVar("db_wrote_to_primary", default=False)
+_replica_failed = contextvars.ContextVar("db_replica_failed", default=False)
+
+_health_lock = threading.Lock()
+_health = {"ok": True, "checked_at": 0.0}
+HEALTH_CHECK_INTERVAL = 10  # seconds between replica probes per process
+
+CATALOG_WRITE_KEY = "db:replica:catalog_write_until"
+
+
+def replica_configured() -> bool:
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def use_primary():
+    """Route every read inside the block to the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+@contextmanager
+def track_writes():
+    """Record whether the ORM routed a write inside the block (see wrote_to_primary)."""
+    token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        _wrote.reset(token)
+
+
+def wrote_to_primary() -> bool:
+    return _wrote.get()
+
+
+def _watch_replica_query(execute, sql, params, many, context):
+    try:
+        return execute(sql, params, many, context)
+    except (OperationalError, InterfaceError):
+        _replica_failed.set(True)
+        raise
+
+
+@contextmanager
+def watch_replica():
+    """Record whether a query on the replica connection failed inside the block (see replica_failed)."""
+    token = _replica_failed.set(False)
+    try:
+        with connections[REPLICA].execute_wrapper(_watch_replica_query):
+            yield
+    finally:
+        _replica_failed.reset(token)
+
+
+def replica_failed() -> bool:
+    return _replica_failed.get()
+
+
+def mark_catalog_write() -> None:
+    """Called from catalog signals: pin catalog reads to the primary until replicas catch up."""
+    if replica_configured():
+        window = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 10)
+        cache.set(CATALOG_WRITE_KEY, time.time() + window, window)
+
+
+def recent_catalog_write() -> bool:
+    until = cache.get(CATALOG_WRITE_KEY)
+    return until is not None and until > time.time()
+
+
+def _probe_replica() -> bool:
+    connection = connections[REPLICA]
+    try:
+        connection.ensure_connection()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                # NULL on a primary or an idle standby; treat that as "not lagging".
+                cursor.execute("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())")
+                lag = cursor.fetchone()[0]
+            if lag is not None and lag > getattr(settings, "DATABASE_REPLICA_MAX_LAG", 10):
+                logger.warning("database replica is %.1fs behind; reading from primary", lag)
+                return False
+        return True
+    except DatabaseError:
+        logger.warning("database replica unreachable; reading from primary", exc_info=True)
+        connection.close()
+        return False
+
+
+def replica_available() -> bool:
+    now = time.monotonic()
+    retry = getattr(settings, "DATABASE_REPLICA_RETRY", 30)
+    interval = HEALTH_CHECK_INTERVAL if _health["ok"] else retry
+    if now - _health["checked_at"] < interval:
+        return _health["ok"]
+    with _health_lock:
+        if now - _health["checked_at"] >= interval:
+            _health["ok"] = _probe_replica()
+            _health["checked_at"] = time.monotonic()
+    return _health["ok"]
+
+
+def _replica_connected() -> bool:
+    """Open the replica connection before routing to it; a failed connect falls back to the primary."""
+    connection = connections[REPLICA]
+    if connection.connection is not None:
+        return True
+    try:
+        connection.ensure_connection()
+        return True
+    except DatabaseError:
+        logger.warning("database replica connection failed; reading from primary", exc_info=True)
+        mark_replica_failed()
+        connection.close()
+        return False
+
+
+def mark_replica_failed() -> None:
+    """Skip the replica for DATABASE_REPLICA_RETRY seconds after a query error on it."""
+    with _health_lock:
+        _health["ok"] = False
+        _health["checked_at"] = time.monotonic()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _pinned.get() or model._meta.app_label not in REPLICA_APPS:
+            return PRIMARY
+        return REPLICA if replica_available() and _replica_connected() else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
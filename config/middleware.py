@@ -1,4 +1,30 @@
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 from django.http import HttpResponse
+from django.http.cookie import SimpleCookie
+from django.middleware.cache import CacheMiddleware
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import has_vary_header, patch_response_headers, patch_vary_headers
+from django.utils.decorators import decorator_from_middleware_with_args
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+from .db_router import (
+    REPLICA,
+    mark_replica_failed,
+    recent_catalog_write,
+    replica_configured,
+    replica_failed,
+    track_writes,
+    use_primary,
+    watch_replica,
+    wrote_to_primary,
+)
 
 
 class SimpleCorsMiddleware:
@@ -31,3 +57,177 @@ class SimpleCorsMiddleware:
             response["Access-Control-Allow-Methods"] = "GET, POST, OPTIONS"
             response["Access-Control-Allow-Headers"] = "Content-Type, Authorization, Accept"
         return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Decide per request whether catalog reads may use the read replica (see config.db_router).
+    Writes, pinned paths (admin, account, checkout), a client's own recent writes and the
+    window after any catalog edit stay on the primary. A replica that cannot be connected to is
+    skipped by the router; a safe request whose replica query fails mid-request is run once more
+    on the primary, unless it already wrote something.
+    """
+
+    COOKIE_NAME = "db_primary_until"
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pinned_paths = tuple(getattr(settings, "DATABASE_REPLICA_PINNED_PATHS", ()))
+        self.window = getattr(settings, "DATABASE_REPLICA_MAX_LAG", 10)
+
+    def _should_pin(self, request):
+        if request.method not in self.SAFE_METHODS or request.path.startswith(self.pinned_paths):
+            return True
+        try:
+            # Read-your-writes: this client changed something moments ago.
+            if float(request.COOKIES.get(self.COOKIE_NAME, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        return recent_catalog_write()
+
+    def _respond(self, request, pinned):
+        if pinned:
+            request.db_pinned_to_primary = True
+            with use_primary():
+                return self.get_response(request)
+        return self.get_response(request)
+
+    def __call__(self, request):
+        pinned = self._should_pin(request)
+        with track_writes(), watch_replica():
+            response = self._respond(request, pinned)
+            if (
+                response.status_code == 500
+                and not pinned
+                and request.method in self.SAFE_METHODS
+                # Only a failure on the replica's own connection; primary-side errors
+                # ("database is locked", ...) are returned as they are.
+                and replica_failed()
+                # Running the request again would repeat writes such as view counts.
+                and not wrote_to_primary()
+            ):
+                # The replica went away mid-request: stop using it and run the request once more.
+                mark_replica_failed()
+                connections[REPLICA].close()
+                response = self._respond(request, True)
+
+        if request.method not in self.SAFE_METHODS:
+            response.set_cookie(
+                self.COOKIE_NAME,
+                str(int(time.time() + self.window)),
+                max_age=self.window,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+_accepts_gzip_re = _lazy_re_compile(r"\bgzip\b")
+
+
+class CompressedCacheMiddleware(CacheMiddleware):
+    """
+    Page cache that stores the gzip-compressed body instead of the raw HTML/JSON.
+
+    The body is compressed once, when the page is stored; GZipMiddleware leaves responses that
+    already carry Content-Encoding alone, so a hit costs a cache read and no deflate pass.
+    Clients that do not accept gzip get the body decompressed on the way out, and the
+    entry is keyed and stored without Vary: Accept-Encoding, so both kinds of client
+    share one stored copy. Use through compressed_cache_page().
+    """
+
+    min_length = 200  # same threshold as GZipMiddleware
+
+    def process_request(self, request):
+        response = super().process_request(request)
+        if response is not None:
+            response = self._negotiate(request, response)
+        return response
+
+    def process_response(self, request, response):
+        if response.streaming:
+            return self._store_when_streamed(request, response)
+        if (
+            getattr(request, "_cache_update_cache", False)
+            and request.method == "GET"
+            and response.status_code == 200
+            and not response.streaming
+            and not response.has_header("Content-Encoding")
+            and not (hasattr(response, "render") and not response.is_rendered)
+            and len(response.content) >= self.min_length
+        ):
+            raw = response.content
+            compressed = compress_string(raw, max_random_bytes=GZipMiddleware.max_random_bytes)
+            if len(compressed) < len(raw):
+                # Validator of the uncompressed body: stays stable across re-stores (gzip
+                # output is randomly padded) and across gzip/identity clients.
+                if not response.has_header("ETag"):
+                    response.headers["ETag"] = f'W/"{hashlib.md5(raw).hexdigest()}"'
+                response.content = compressed
+                response.headers["Content-Length"] = str(len(compressed))
+                response.headers["Content-Encoding"] = "gzip"
+        # Stored as-is: Vary: Accept-Encoding is added below, after the cache key is learned.
+        response = super().process_response(request, response)
+        return self._negotiate(request, response)
+
+    def _store_when_streamed(self, request, response):
+        """
+        Let a StreamingHttpResponse go out unchanged and cache the joined body once the last
+        chunk has been sent. Headers are copied now, before outer middleware (GZip, sessions,
+        CSRF) rewrites them for this one visitor; an aborted stream is not stored.
+        """
+        if (
+            not getattr(request, "_cache_update_cache", False)
+            or request.method != "GET"
+            or response.status_code != 200
+            or response.is_async
+            # Like the non-streamed path, only what the view itself produced is stored; a view
+            # response that already sets or varies on cookies is per-visitor.
+            or response.cookies
+            or has_vary_header(response, "Cookie")
+        ):
+            return response
+        copy = HttpResponse(status=response.status_code)
+        for header, value in response.items():
+            copy.headers[header] = value
+        # Own jar: the live response's is filled by SessionMiddleware/CSRF for this visitor
+        # before the stream ends, and must never reach the shared entry.
+        copy.cookies = SimpleCookie()
+        if self.page_timeout is not None:
+            patch_response_headers(response, self.page_timeout)
+        chunks = response.streaming_content
+
+        def tee():
+            body = []
+            for chunk in chunks:
+                body.append(chunk)
+                yield chunk
+            copy.content = b"".join(body)
+            self.process_response(request, copy)
+
+        response.streaming_content = tee()
+        return response
+
+    def _negotiate(self, request, response):
+        if response.get("Content-Encoding") != "gzip":
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not _accepts_gzip_re.search(request.META.get("HTTP_ACCEPT_ENCODING", "")):
+            # Cached objects are fresh unpickled copies, so rewriting the body is safe.
+            response.content = gzip.decompress(response.content)
+            response.headers["Content-Length"] = str(len(response.content))
+            del response.headers["Content-Encoding"]
+        return response
+
+
+def compressed_cache_page(timeout, *, cache=None, key_prefix=None):
+    """Drop-in for django.views.decorators.cache.cache_page backed by CompressedCacheMiddleware."""
+    return decorator_from_middleware_with_args(CompressedCacheMiddleware)(
+        page_timeout=timeout,
+        cache_alias=cache,
+        key_prefix=key_prefix,
+    )
@@ -4,6 +4,8 @@ from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 
+from config.sqlite_backend import PRODUCTION_PRAGMAS
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
 
@@ -46,6 +48,7 @@ MIDDLEWARE = [
     "django.middleware.gzip.GZipMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "config.middleware.SimpleCorsMiddleware",
+    "config.middleware.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -78,24 +81,26 @@ WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
 # --- Database ---
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL:
-    parsed = urlparse(DATABASE_URL)
+def _database_from_url(url):
+    parsed = urlparse(url)
     scheme = (parsed.scheme or "").lower()
     if scheme in {"mysql", "mysql2"}:
-        ENGINE = "django.db.backends.mysql"
+        engine = "django.db.backends.mysql"
     else:
-        ENGINE = "django.db.backends.postgresql"
-    DATABASES = {
-        "default": {
-            "ENGINE": ENGINE,
-            "NAME": parsed.path.lstrip("/") or "",
-            "USER": parsed.username or "",
-            "PASSWORD": parsed.password or "",
-            "HOST": parsed.hostname or "localhost",
-            "PORT": parsed.port or "5432",
-        }
+        engine = "django.db.backends.postgresql"
+    return {
+        "ENGINE": engine,
+        "NAME": parsed.path.lstrip("/") or "",
+        "USER": parsed.username or "",
+        "PASSWORD": parsed.password or "",
+        "HOST": parsed.hostname or "localhost",
+        "PORT": parsed.port or "5432",
     }
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if DATABASE_URL:
+    DATABASES = {"default": _database_from_url(DATABASE_URL)}
 else:
     DATABASES = {
         "default": {
@@ -103,8 +108,36 @@ else:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+    # Single-host (cPanel) installs: WAL lets readers run alongside the writer (view counts,
+    # sessions, orders); see config/sqlite_backend. DJANGO_SQLITE_TUNING=False restores stock SQLite.
+    if os.getenv("DJANGO_SQLITE_TUNING", "True").lower() == "true":
+        DATABASES["default"]["ENGINE"] = "config.sqlite_backend"
+        DATABASES["default"]["OPTIONS"] = {
+            "transaction_mode": "IMMEDIATE",
+            "pragmas": {
+                **PRODUCTION_PRAGMAS,
+                "busy_timeout": int(os.getenv("DJANGO_SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            },
+        }
 DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DJANGO_CONN_MAX_AGE", "60"))
 
+# Optional read replica for catalog reads (config/db_router.py). Writes, admin, account and
+# checkout stay on "default"; an unreachable or lagging replica is skipped automatically.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+DATABASE_REPLICA_MAX_LAG = int(os.getenv("DATABASE_REPLICA_MAX_LAG", "10"))  # seconds
+DATABASE_REPLICA_RETRY = int(os.getenv("DATABASE_REPLICA_RETRY", "30"))  # seconds before re-probing
+DATABASE_REPLICA_PINNED_PATHS = ["/admin/", "/account/", "/buyurtma/", "/api/orders/"]
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = {
+        **_database_from_url(DATABASE_REPLICA_URL),
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "TEST": {"MIRROR": "default"},
+    }
+    if DATABASES["replica"]["ENGINE"] == "django.db.backends.postgresql":
+        # Fail fast so failover kicks in instead of hanging the request.
+        DATABASES["replica"]["OPTIONS"] = {"connect_timeout": 3}
+    DATABASE_ROUTERS = ["config.db_router.PrimaryReplicaRouter"]
+
 # --- Password validation ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -132,6 +165,20 @@ else:
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Catalog uploads are named by content hash: identical re-uploads share one file and media
+# URLs never change meaning (long-lived Cache-Control in media.conf; `gc_media` cleans up).
+DEFAULT_FILE_STORAGE = "config.storage.ContentAddressedStorage"
+# On-demand resizes at /media/resized/<w>x<h>/<path>; only these sizes are rendered.
+IMAGE_RESIZE_SIZES = [
+    size.strip()
+    for size in os.getenv(
+        "IMAGE_RESIZE_SIZES",
+        "80x110,88x120,160x220,200x120,300x400,320x440,420x240,600x700,640x880",
+    ).split(",")
+    if size.strip()
+]
+IMAGE_RESIZE_WORKERS = int(os.getenv("IMAGE_RESIZE_WORKERS", "2"))
+IMAGE_RESIZE_MAX_PENDING = int(os.getenv("IMAGE_RESIZE_MAX_PENDING", "32"))
 
 # --- Cache ---
 _redis_url = os.getenv("REDIS_URL") or os.getenv("DJANGO_REDIS_URL")
@@ -210,6 +257,18 @@ if not DEBUG:
         SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
         SESSION_CACHE_ALIAS = "default"
 
+# --- Cache warm-up (python manage.py warm_cache) ---
+# Each worker warms its own locmem cache on boot when enabled; with Redis one warm_cache run is enough.
+CACHE_WARMUP_ON_BOOT = os.getenv("CACHE_WARMUP_ON_BOOT", "False").lower() == "true"
+CACHE_WARMUP_BASE_URL = os.getenv("CACHE_WARMUP_BASE_URL", "")
+CACHE_WARMUP_URLS_FILE = os.getenv("CACHE_WARMUP_URLS_FILE", "")
+CACHE_WARMUP_ACCESS_LOG = os.getenv("CACHE_WARMUP_ACCESS_LOG", "")
+CACHE_WARMUP_WORKERS = int(os.getenv("CACHE_WARMUP_WORKERS", "4"))
+
+# --- Catalog snapshot (media/snapshots/catalog-latest.json) ---
+# Rebuilt in a debounced background thread after catalog edits; `build_catalog_snapshot` does it on demand.
+CATALOG_SNAPSHOT_AUTO_REBUILD = os.getenv("CATALOG_SNAPSHOT_AUTO_REBUILD", str(not DEBUG)).lower() == "true"
+
 SHOP_LAT = float(os.getenv("SHOP_LAT", "41.2995"))
 SHOP_LNG = float(os.getenv("SHOP_LNG", "69.2401"))
 DELIVERY_BASE_FEE_UZS = int(os.getenv("DELIVERY_BASE_FEE_UZS", "10000"))
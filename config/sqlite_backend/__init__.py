@@ -0,0 +1,11 @@
+# SQLite engine with production PRAGMAs; see base.py.
+
+# Applied in order to every new connection when DJANGO_SQLITE_TUNING is on (config/settings.py).
+PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # durable across app crashes; with WAL, FULL buys little
+    "busy_timeout": 5000,  # ms to wait for the write lock instead of raising "database is locked"
+    "mmap_size": 128 * 1024 * 1024,
+    "cache_size": -20000,  # negative = KiB, ~20 MB page cache per connection
+    "temp_store": "MEMORY",
+}
@@ -0,0 +1,30 @@
+"""
+django.db.backends.sqlite3 plus a production profile applied to every new connection.
+
+OPTIONS["pragmas"] is a dict of PRAGMA name -> value, run in order right after connecting
+(WAL journal, synchronous=NORMAL, busy_timeout, mmap/cache sizes, temp_store).
+OPTIONS["transaction_mode"] = "IMMEDIATE" makes atomic blocks take the write lock up front,
+so concurrent writers wait for busy_timeout instead of failing with "database is locked"
+when a read transaction tries to upgrade.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.sqlite_pragmas = params.pop("pragmas", {})
+        self.sqlite_transaction_mode = (params.pop("transaction_mode", "") or "").upper()
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.sqlite_pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.sqlite_transaction_mode in ("IMMEDIATE", "EXCLUSIVE"):
+            self.cursor().execute(f"BEGIN {self.sqlite_transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
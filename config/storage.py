@@ -0,0 +1,45 @@
+"""
+Content-addressed media storage.
+
+Uploads under HASHED_PREFIXES are stored as <prefix>/<sha256[:32]><ext>, so re-uploading the
+same cover or banner reuses the existing file instead of writing covers/x_AbC123.jpg again,
+and a media URL always maps to the same bytes (safe to cache forever; see media.conf).
+Everything else (thumbs/, resized/, snapshots/) keeps the name it is given.
+Files nothing references any more are removed by `python manage.py gc_media`.
+"""
+import hashlib
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+HASH_LENGTH = 32
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    # upload_to directories of the catalog image fields.
+    HASHED_PREFIXES = ("covers/", "authors/", "banners/", "about/")
+
+    def is_hashed_name(self, name: str) -> bool:
+        return name.replace("\\", "/").startswith(self.HASHED_PREFIXES)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not self.is_hashed_name(name):
+            return super().save(name, content, max_length=max_length)
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        directory, filename = posixpath.split(name.replace("\\", "/"))
+        extension = posixpath.splitext(filename)[1].lower()
+        name = self.generate_filename(posixpath.join(directory, f"{digest.hexdigest()[:HASH_LENGTH]}{extension}"))
+        if self.exists(name):
+            # Same bytes are already stored under this name.
+            return name
+        # A concurrent identical upload may still win the race; _save then falls back to a
+        # suffixed name, which only costs one duplicate file.
+        return super().save(name, content, max_length=max_length)
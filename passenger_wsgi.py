@@ -10,3 +10,7 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 from django.core.wsgi import get_wsgi_application
 
 application = get_wsgi_application()
+
+from apps.catalog.services.warmup import warm_on_boot  # noqa: E402
+
+warm_on_boot()